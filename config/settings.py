@@ -39,6 +39,15 @@ class AppSettings(BaseSettings):
     ENABLE_DEBUG_MODE: bool = Field(default=False, env="DEBUG")
     PROCESSING_TIMEOUT_SECONDS: int = Field(default=120, description="Processing timeout")
     
+    # Extraction cache settings
+    EXTRACTION_CACHE_MAX_ENTRIES: int = Field(default=128, description="Maximum extractions kept in memory")
+    EXTRACTION_CACHE_TTL_SECONDS: int = Field(default=3600, description="Seconds before a cached extraction expires")
+    EXTRACTION_CACHE_DIR: str = Field(
+        default="",
+        description="Directory for a persistent on-disk extraction cache; empty keeps extractions in memory only"
+    )
+    EXTRACTION_CACHE_SIZE_LIMIT_MB: int = Field(default=100, description="Maximum size of the on-disk extraction cache in MB")
+    
     # UI settings
     APP_TITLE: str = Field(default="Intelligent Resume Parser", description="Application title")
     APP_DESCRIPTION: str = Field(
@@ -57,10 +66,21 @@ class AppSettings(BaseSettings):
 # Global settings instance
 settings = AppSettings()
 
+# Human-readable document type for each supported extension
+_FILE_TYPE_MAPPING = {
+    ".pdf": "PDF Document",
+    ".docx": "Word Document (DOCX)",
+    ".doc": "Word Document (DOC)",
+    ".txt": "Text Document",
+    ".html": "HTML Document",
+    ".htm": "HTML Document"
+}
+
 
 def validate_file_extension(filename: str) -> bool:
     """Check if file extension is supported."""
-    ext = os.path.splitext(filename.lower())[1]
+    # Only the extension needs lower-casing, not the whole filename
+    ext = os.path.splitext(filename)[1].lower()
     return ext in settings.SUPPORTED_EXTENSIONS
 
 
@@ -72,13 +92,5 @@ def validate_file_size(file_size: int) -> bool:
 
 def get_file_type_from_extension(filename: str) -> str:
     """Get file type description from extension."""
-    ext = os.path.splitext(filename.lower())[1]
-    type_mapping = {
-        ".pdf": "PDF Document",
-        ".docx": "Word Document (DOCX)",
-        ".doc": "Word Document (DOC)",
-        ".txt": "Text Document",
-        ".html": "HTML Document",
-        ".htm": "HTML Document"
-    }
-    return type_mapping.get(ext, "Unknown Document Type")
+    ext = os.path.splitext(filename)[1].lower()
+    return _FILE_TYPE_MAPPING.get(ext, "Unknown Document Type")
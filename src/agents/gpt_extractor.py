@@ -1,14 +1,19 @@
 """
-GPT-4o powered resume data extractor using function calling.
+GPT-4o powered resume data extractor using strict structured outputs.
 Transforms parsed document sections into structured resume data matching the canonical JSON schema.
 """
 
 import json
 import os
+import re
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 import tiktoken
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 from openai import OpenAI
+from pydantic import ValidationError
 
 from config.settings import settings
 from src.models.schema import (
@@ -17,7 +22,175 @@ from src.models.schema import (
     ParserMetadata, Culture
 )
 from src.models.resume_elements import ParsedDocument, ResumeSection
-from src.models.token_usage import TokenUsage, TokenTracker
+from src.models.token_usage import TokenUsage
+
+# Bump whenever the prompts or response schemas change so cached extractions
+# produced by older prompts are not reused
+PROMPT_VERSION = "5"
+
+# Any run of whitespace (including newlines, carriage returns and tabs)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Characters of resume text sent per section, to prevent token limit issues
+_MAX_SECTION_CHARS = 8000
+
+# Patterns used to repair malformed JSON returned by GPT
+# String values in JSON, handling escaped characters inside them
+_JSON_STRING_RE = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"')
+# Trailing commas before closing braces/brackets
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+# Unquoted property names
+_UNQUOTED_PROPERTY_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*:')
+
+# Extraction is split into independent sub-tasks that run concurrently; each asks
+# GPT-4o for a subset of the schema's top-level fields and the results are merged
+_EXTRACTION_TASKS = {
+    "basic": ["contactInfo", "summary", "experienceSummary"],
+    "work": ["workExperience"],
+    "education": ["education", "certifications"],
+    "skills": ["skills"],
+}
+
+# Resume models each sub-task's fields are validated against before its result is
+# accepted, so a sub-task only checks the part of the schema it produced
+_TASK_MODELS = {
+    "basic": {"contactInfo": ContactInfo, "experienceSummary": ExperienceSummary},
+    "work": {"workExperience": WorkExperience},
+    "education": {"education": Education, "certifications": Certification},
+    "skills": {"skills": Skill},
+}
+
+# How often (in seconds) streamed progress is reported while sub-tasks run
+_PROGRESS_POLL_INTERVAL = 0.25
+
+# Follow-up attempts for a sub-task whose response fails JSON parsing or schema
+# validation; the error is sent back to GPT-4o so it can correct its output
+_MAX_EXTRACTION_RETRIES = 2
+
+# Resume sections each sub-task needs to see; unclassified text is always sent since
+# it may hold anything, and a task whose sections are all missing gets every section
+_EXTRACTION_TASK_SECTIONS = {
+    "basic": ["contact", "summary", "objective", "experience"],
+    "work": ["experience"],
+    "education": ["education", "certifications"],
+    "skills": ["skills", "experience", "projects", "summary"],
+}
+
+# Inference rules: inferred skill -> resume terms that justify the inference
+_SKILL_INFERENCE_RULES = {
+    # Technical stack inferences
+    "data analysis": ["python", "analytics", "data"],
+    "problem solving": ["engineer", "developer", "software", "technical"],
+    "object-oriented programming": ["python", "java", "c++", "oop"],
+    "html": ["react", "javascript", "web", "frontend", "ui"],
+    "css": ["react", "javascript", "web", "frontend", "ui"],
+    "dom manipulation": ["javascript", "react", "frontend"],
+    "debugging": ["developer", "engineer", "programming", "software"],
+    "component architecture": ["react", "frontend", "ui"],
+    "state management": ["react", "frontend", "javascript"],
+    "backend development": ["node.js", "django", "flask", "api", "server"],
+    "api development": ["backend", "rest", "node.js", "django", "flask"],
+    "cloud architecture": ["aws", "gcp", "cloud", "azure"],
+    "scalability": ["aws", "cloud", "microservices", "architecture"],
+    "infrastructure management": ["aws", "cloud", "devops", "docker"],
+    
+    # Role-based inferences
+    "mentoring": ["senior", "lead", "mentor"],
+    "code review": ["senior", "lead", "engineer"],
+    "technical leadership": ["senior", "lead", "architect"],
+    "project management": ["lead", "manager", "project"],
+    "team coordination": ["lead", "manager", "team"],
+    "technical decision making": ["lead", "senior", "architect"],
+    "technical documentation": ["engineer", "developer", "technical"],
+    "testing": ["engineer", "developer", "qa", "software"],
+    
+    # Experience-based inferences
+    "collaboration": ["team", "agile", "cross-functional"],
+    "agile methodologies": ["agile", "sprint", "scrum"],
+    "version control": ["git", "github", "development"],
+    "software development lifecycle": ["developer", "engineer", "software"],
+    
+    # Education-based inferences
+    "algorithms": ["computer science", "cs", "engineering"],
+    "data structures": ["computer science", "cs", "programming"],
+    "software engineering principles": ["computer science", "cs", "engineering"],
+}
+
+# Every trigger term, so a resume can be scanned once rather than once per skill
+_INFERENCE_TRIGGERS = frozenset(
+    trigger for triggers in _SKILL_INFERENCE_RULES.values() for trigger in triggers
+)
+
+# Common spellings of skills that count as an explicit mention in the resume
+_SKILL_VARIATIONS = {
+    "javascript": ["js", "javascript"],
+    "python": ["python", "py"],
+    "react": ["react", "reactjs", "react.js"],
+    "node.js": ["node", "nodejs", "node.js"],
+    "postgresql": ["postgres", "postgresql"],
+    "mongodb": ["mongo", "mongodb"],
+}
+
+# Technologies mapped to the skills they imply, shared by every extractor instance
+_SKILL_INFERENCE_DATABASE = {
+    # Web Frameworks → Languages & Skills
+    "streamlit": ["Python", "Web Development", "Data Visualization", "Dashboard Development"],
+    "django": ["Python", "Web Development", "Backend Development", "MVC Architecture", "ORM"],
+    "flask": ["Python", "Web Development", "Backend Development", "REST APIs", "Microservices"],
+    "react": ["JavaScript", "Frontend Development", "HTML", "CSS", "Component Architecture", "SPA"],
+    "angular": ["TypeScript", "JavaScript", "Frontend Development", "HTML", "CSS", "SPA"],
+    "vue": ["JavaScript", "Frontend Development", "HTML", "CSS", "Component Architecture"],
+    "node.js": ["JavaScript", "Backend Development", "Server-side Development", "npm"],
+    "express": ["JavaScript", "Node.js", "Backend Development", "REST APIs", "Web Servers"],
+    
+    # Cloud Platforms → DevOps & Infrastructure
+    "aws": ["Cloud Computing", "DevOps", "Infrastructure", "Scalability", "EC2", "S3"],
+    "azure": ["Cloud Computing", "DevOps", "Infrastructure", "Microsoft Technologies"],
+    "gcp": ["Cloud Computing", "DevOps", "Infrastructure", "Google Technologies"],
+    "docker": ["Containerization", "DevOps", "Linux", "Deployment", "Microservices"],
+    "kubernetes": ["Container Orchestration", "DevOps", "Scalability", "Microservices", "Linux"],
+    
+    # Databases → Data Skills
+    "postgresql": ["SQL", "Database Design", "Relational Databases", "Data Modeling"],
+    "mysql": ["SQL", "Database Design", "Relational Databases", "Data Modeling"],
+    "mongodb": ["NoSQL", "Database Design", "Document Databases", "JSON"],
+    "redis": ["Caching", "In-memory Databases", "Performance Optimization"],
+    
+    # Data Science & ML → Analytics Skills
+    "pandas": ["Python", "Data Analysis", "Data Manipulation", "Statistics"],
+    "numpy": ["Python", "Scientific Computing", "Mathematical Computing", "Data Analysis"],
+    "scikit-learn": ["Machine Learning", "Python", "Data Science", "Predictive Modeling"],
+    "tensorflow": ["Machine Learning", "Deep Learning", "Python", "AI", "Neural Networks"],
+    "pytorch": ["Machine Learning", "Deep Learning", "Python", "AI", "Neural Networks"],
+    
+    # Mobile Development
+    "react native": ["Mobile Development", "JavaScript", "Cross-platform Development", "iOS", "Android"],
+    "flutter": ["Mobile Development", "Dart", "Cross-platform Development", "iOS", "Android"],
+    "swift": ["iOS Development", "Mobile Development", "Apple Ecosystem"],
+    "kotlin": ["Android Development", "Mobile Development", "JVM Languages"],
+    
+    # DevOps & Tools
+    "jenkins": ["CI/CD", "DevOps", "Automation", "Build Pipelines"],
+    "git": ["Version Control", "Collaboration", "Source Code Management"],
+    "github": ["Version Control", "Collaboration", "Open Source", "Git"],
+    "gitlab": ["Version Control", "CI/CD", "DevOps", "Git"],
+    
+    # Testing
+    "pytest": ["Python", "Testing", "Test Automation", "Quality Assurance"],
+    "jest": ["JavaScript", "Testing", "Frontend Testing", "Unit Testing"],
+    "selenium": ["Test Automation", "Web Testing", "Quality Assurance"],
+}
+
+
+class _ExtractionTaskError(Exception):
+    """Raised when a sub-task fails or is cancelled, carrying the tokens it had already used."""
+    
+    def __init__(self, message: str, input_tokens: int, output_tokens: int, cached_tokens: int):
+        super().__init__(message)
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.cached_tokens = cached_tokens
+
 
 class GPTExtractor:
     """GPT-4o powered extractor for structured resume data."""
@@ -29,88 +202,359 @@ class GPTExtractor:
         
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL
-        self.skill_inference_db = self._build_skill_inference_database()
+        self.skill_inference_db = _SKILL_INFERENCE_DATABASE
         
-        # Initialize token tracking
-        self.token_tracker = TokenTracker()
+        # Token usage is returned per extraction rather than tracked here, since
+        # one extractor instance is shared by every user session
         try:
             self.tokenizer = tiktoken.encoding_for_model(self.model)
         except KeyError:
             # Fallback to cl100k_base encoding for GPT-4o
             self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        
+        # The system prompt and response schemas never change between documents,
+        # so build them and count their tokens once
+        self.system_prompt = self._create_system_prompt()
+        self.function_schema = self._create_function_schema()
+        self.task_response_formats = {
+            task: self._create_response_format(self._create_task_function_schema(fields))
+            for task, fields in _EXTRACTION_TASKS.items()
+        }
+        self.task_static_input_tokens = {
+            task: self._count_static_input_tokens(response_format)
+            for task, response_format in self.task_response_formats.items()
+        }
     
-    def extract_structured_data(self, parsed_doc: ParsedDocument) -> Optional[ResumeSchema]:
+    def extract_structured_data(
+        self,
+        parsed_doc: ParsedDocument,
+        progress_callback: Optional[Callable[[int, int, int], None]] = None
+    ) -> Tuple[Optional[ResumeSchema], Optional[TokenUsage]]:
         """
-        Extract structured resume data from parsed document using GPT-4o function calling.
+        Extract structured resume data from parsed document using GPT-4o structured outputs.
+        
+        The extraction is split into independent sub-tasks (basic info, work
+        experience, education, skills) that are sent to GPT-4o concurrently, so
+        the wall-clock time is that of the slowest sub-task rather than the sum.
+        Responses are streamed, so progress can be reported while they arrive.
         
         Args:
             parsed_doc: Parsed document with grouped sections
+            progress_callback: Optional callable receiving (completed sub-tasks, total
+                sub-tasks, output tokens streamed so far); it is called periodically
+                and always from the calling thread
             
         Returns:
-            ResumeSchema object with structured data or None if extraction fails
+            Tuple of (ResumeSchema object with structured data, token usage of the
+            extraction). If extraction fails the schema is None and the usage covers
+            the tokens already spent, or is None if no request was made
         """
+        token_usage = None
         try:
             # Prepare section content for GPT processing
             section_content = self._prepare_section_content(parsed_doc)
             
-            # Create the function calling prompt
-            system_prompt = self._create_system_prompt()
-            user_prompt = self._create_user_prompt(section_content, parsed_doc)
+            # Number every line so long fields can be returned as line ranges
+            numbered_content, resume_lines = self._number_resume_lines(section_content)
             
-            # Define the function schema for structured extraction
-            function_schema = self._create_function_schema()
+            extracted_data = {}
+            total_input_tokens = 0
+            total_output_tokens = 0
+            total_cached_tokens = 0
             
-            # Count input tokens before API call
-            input_tokens = self._count_input_tokens(system_prompt, user_prompt, function_schema)
-            
-            # Call GPT-4o with function calling
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                functions=[function_schema],
-                function_call={"name": "extract_resume_data"},
-                temperature=settings.OPENAI_TEMPERATURE,
-                max_tokens=settings.OPENAI_MAX_TOKENS
-            )
+            # Workers record streamed token counts under their own task name only;
+            # this thread reads them to report progress
+            streamed_tokens = dict.fromkeys(_EXTRACTION_TASKS, 0)
             
-            # Extract function call result
-            function_call = response.choices[0].message.function_call
-            if not function_call or function_call.name != "extract_resume_data":
-                raise ValueError("GPT-4o did not return expected function call")
+            # Set on the first failed sub-task so the others stop instead of
+            # finishing work whose result would be thrown away
+            cancel_event = threading.Event()
+            failure = None
             
-            # Count output tokens and track usage
-            output_tokens = self._count_output_tokens(function_call.arguments)
-            self._track_token_usage(input_tokens, output_tokens, response)
-            
-            # Parse the structured data with error handling
-            try:
-                extracted_data = json.loads(function_call.arguments)
-            except json.JSONDecodeError as json_error:
-                print(f"JSON parsing error: {json_error}")
-                print(f"JSON string preview: {function_call.arguments[:500]}...")
+            # The OpenAI client is thread-safe, so all sub-tasks share its connection pool
+            with ThreadPoolExecutor(max_workers=len(_EXTRACTION_TASKS)) as executor:
+                # Each sub-task only receives the sections relevant to its fields
+                pending = {
+                    executor.submit(
+                        self._run_extraction_task,
+                        task,
+                        self._create_user_prompt(
+                            self._build_context_snippet(task, numbered_content), parsed_doc
+                        ),
+                        resume_lines,
+                        streamed_tokens,
+                        cancel_event
+                    )
+                    for task in _EXTRACTION_TASKS
+                }
+                completed = 0
                 
-                # Try to fix common JSON issues
-                fixed_json = self._fix_json_string(function_call.arguments)
-                try:
-                    extracted_data = json.loads(fixed_json)
-                except json.JSONDecodeError as second_error:
-                    print(f"Failed to fix JSON: {second_error}")
-                    raise ValueError(f"Unable to parse GPT response as valid JSON: {json_error}")
+                while pending:
+                    done, pending = wait(pending, timeout=_PROGRESS_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.cancelled():
+                            continue
+                        
+                        try:
+                            task_data, input_tokens, output_tokens, cached_tokens = future.result()
+                        except _ExtractionTaskError as e:
+                            input_tokens, output_tokens, cached_tokens = e.input_tokens, e.output_tokens, e.cached_tokens
+                            if failure is None:
+                                failure = e
+                                cancel_event.set()
+                                for other in pending:
+                                    other.cancel()
+                        else:
+                            extracted_data.update(task_data)
+                            completed += 1
+                        
+                        total_input_tokens += input_tokens
+                        total_output_tokens += output_tokens
+                        total_cached_tokens += cached_tokens
+                    
+                    if progress_callback:
+                        progress_callback(completed, len(_EXTRACTION_TASKS), sum(streamed_tokens.values()))
+            
+            # Report the sub-tasks as a single extraction, including the tokens
+            # spent by a failed one so the session cost stays accurate
+            token_usage = self._create_token_usage(total_input_tokens, total_output_tokens, total_cached_tokens)
+            if failure is not None:
+                raise failure
             
             # Create ResumeSchema object
-            resume_schema = self._create_resume_schema(extracted_data, parsed_doc)
+            resume_schema = self._create_resume_schema(
+                extracted_data, parsed_doc, section_content, resume_lines
+            )
             
-            return resume_schema
+            return resume_schema, token_usage
             
         except Exception as e:
             print(f"GPT extraction failed: {str(e)}")
             if "Unterminated string" in str(e):
                 print("This appears to be a JSON parsing issue. The GPT response may contain unescaped quotes or newlines.")
                 print("Check the resume content for special characters that might be causing JSON formatting issues.")
-            return None
+            return None, token_usage
+    
+    def _run_extraction_task(
+        self,
+        task: str,
+        user_prompt: str,
+        resume_lines: List[str],
+        streamed_tokens: Dict[str, int],
+        cancel_event: threading.Event
+    ) -> Tuple[Dict[str, Any], int, int, int]:
+        """
+        Run one extraction sub-task against GPT-4o.
+        
+        Runs in a worker thread, so it only returns its results and token counts;
+        usage is recorded by the caller once all sub-tasks have finished. If the
+        response cannot be parsed or fails validation, the error is sent back to
+        GPT-4o and the request retried up to _MAX_EXTRACTION_RETRIES times.
+        The sub-task stops early, mid-stream or during backoff, once cancel_event
+        is set.
+        
+        Args:
+            task: Name of the sub-task in _EXTRACTION_TASKS
+            user_prompt: User prompt with the resume content
+            resume_lines: Numbered resume lines that description ranges point into
+            streamed_tokens: Progress counters; this task's entry is updated as the
+                response streams in
+            cancel_event: Set when another sub-task has failed
+            
+        Returns:
+            Tuple of (extracted_fields, input_tokens, output_tokens, cached_tokens)
+            
+        Raises:
+            _ExtractionTaskError: If the request fails, the response is still
+                invalid after all retries, or the sub-task is cancelled
+        """
+        response_format = self.task_response_formats[task]
+        task_prompt = (
+            f"{user_prompt}\n\n"
+            f"FOCUS: For this request, extract only: {', '.join(_EXTRACTION_TASKS[task])}"
+        )
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": task_prompt}
+        ]
+        
+        total_input_tokens = 0
+        total_output_tokens = 0
+        total_cached_tokens = 0
+        
+        for attempt in range(_MAX_EXTRACTION_RETRIES + 1):
+            if cancel_event.is_set():
+                raise _ExtractionTaskError(
+                    f"Extraction of {task} cancelled",
+                    total_input_tokens, total_output_tokens, total_cached_tokens
+                )
+            
+            # Count input tokens before API call
+            input_tokens = self._count_input_tokens(task, task_prompt)
+            
+            # Call GPT-4o with a strict response schema
+            try:
+                content, response = self._stream_structured_output(
+                    task, messages, response_format, streamed_tokens, cancel_event
+                )
+            except Exception as e:
+                raise _ExtractionTaskError(
+                    f"Extraction of {task} failed: {e}",
+                    total_input_tokens, total_output_tokens, total_cached_tokens
+                ) from e
+            
+            # Count output tokens
+            output_tokens = self._count_output_tokens(content)
+            input_tokens, output_tokens, cached_tokens = self._resolve_token_counts(
+                input_tokens, output_tokens, response
+            )
+            total_input_tokens += input_tokens
+            total_output_tokens += output_tokens
+            total_cached_tokens += cached_tokens
+            
+            if cancel_event.is_set():
+                continue
+            
+            try:
+                extracted_data = self._parse_json_response(content)
+                self._validate_task_data(task, extracted_data, resume_lines)
+                return extracted_data, total_input_tokens, total_output_tokens, total_cached_tokens
+            except (ValidationError, ValueError) as e:
+                if attempt == _MAX_EXTRACTION_RETRIES:
+                    raise _ExtractionTaskError(
+                        f"Extraction of {task} failed: {e}",
+                        total_input_tokens, total_output_tokens, total_cached_tokens
+                    ) from e
+                print(f"Extraction of {task} failed on attempt {attempt + 1}, retrying: {e}")
+                
+                # Show GPT-4o its own output and the error so the retry can correct it
+                feedback = f"Your output had error: {e}. Fix and retry."
+                messages.extend([
+                    {"role": "assistant", "content": content},
+                    {"role": "user", "content": feedback}
+                ])
+                task_prompt = f"{task_prompt}\n{content}\n{feedback}"
+                # Back off before retrying, waking early if the extraction is cancelled
+                cancel_event.wait(1.0 * (attempt + 1))
+        
+        raise _ExtractionTaskError(
+            f"Extraction of {task} cancelled",
+            total_input_tokens, total_output_tokens, total_cached_tokens
+        )
+    
+    def _stream_structured_output(
+        self,
+        task: str,
+        messages: List[Dict[str, Any]],
+        response_format: Dict[str, Any],
+        streamed_tokens: Dict[str, int],
+        cancel_event: threading.Event
+    ) -> Tuple[str, Any]:
+        """
+        Stream a schema-constrained JSON response from GPT-4o, counting chunks as they arrive.
+        
+        Args:
+            task: Name of the sub-task, used as its key in streamed_tokens
+            messages: Conversation to send
+            response_format: Strict JSON schema response format for the sub-task
+            streamed_tokens: Progress counters; each streamed chunk is about one token
+            cancel_event: Closes the stream early when set, so no more output is generated
+            
+        Returns:
+            Tuple of (JSON content, final chunk carrying usage, or None if the
+            stream was closed early)
+        """
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            response_format=response_format,
+            temperature=settings.OPENAI_TEMPERATURE,
+            max_tokens=settings.OPENAI_MAX_TOKENS,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        content_parts = []
+        usage_chunk = None
+        
+        for chunk in stream:
+            if cancel_event.is_set():
+                stream.close()
+                break
+            
+            # The last chunk has no choices and only reports token usage
+            if chunk.usage:
+                usage_chunk = chunk
+            if not chunk.choices:
+                continue
+            
+            content = chunk.choices[0].delta.content
+            if content:
+                content_parts.append(content)
+                streamed_tokens[task] += 1
+        
+        return "".join(content_parts), usage_chunk
+    
+    def _parse_json_response(self, content: str) -> Dict[str, Any]:
+        """
+        Parse the JSON returned by GPT-4o, repairing common issues.
+        
+        The strict schema guarantees valid JSON for complete responses, so repair
+        only matters for output cut off by the token limit.
+        
+        Args:
+            content: JSON string returned by GPT-4o
+            
+        Returns:
+            Parsed response
+            
+        Raises:
+            ValueError: If the response cannot be parsed even after repair
+        """
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as json_error:
+            print(f"JSON parsing error: {json_error}")
+            print(f"JSON string preview: {content[:500]}...")
+            
+            # Try to fix common JSON issues
+            fixed_json = self._fix_json_string(content)
+            try:
+                return json.loads(fixed_json)
+            except json.JSONDecodeError as second_error:
+                print(f"Failed to fix JSON: {second_error}")
+                raise ValueError(f"Unable to parse GPT response as valid JSON: {json_error}")
+    
+    def _validate_task_data(
+        self,
+        task: str,
+        task_data: Dict[str, Any],
+        resume_lines: List[str]
+    ) -> None:
+        """
+        Check a sub-task's fields against the resume models it owns.
+        
+        Args:
+            task: Name of the sub-task in _EXTRACTION_TASKS
+            task_data: Fields returned by GPT-4o for the sub-task
+            resume_lines: Numbered resume lines that description ranges point into
+            
+        Raises:
+            ValidationError: If any of the fields does not fit its model
+        """
+        for field_name, model in _TASK_MODELS[task].items():
+            field_data = task_data.get(field_name)
+            if field_data is None:
+                continue
+            
+            items = field_data if isinstance(field_data, list) else [field_data]
+            for item in items:
+                if model is WorkExperience:
+                    item = {
+                        **item,
+                        "description": self._resolve_line_range(item.get("description", ""), resume_lines)
+                    }
+                model.parse_obj(item)
     
     def _prepare_section_content(self, parsed_doc: ParsedDocument) -> Dict[str, str]:
         """
@@ -133,12 +577,107 @@ class GPTExtractor:
         
         return section_content
     
+    def _number_resume_lines(self, section_content: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Sanitize every non-blank line of the resume and prefix it with a running line number.
+        
+        GPT-4o returns long descriptions as [start, end] ranges into these
+        numbers instead of regenerating the text, which is then sliced locally.
+        Lines are sanitized one at a time so the line breaks survive, and only
+        the line text counts towards the per-section character budget.
+        
+        Args:
+            section_content: Dictionary mapping section names to their content
+            
+        Returns:
+            Tuple of (numbered prompt-ready section content, original resume
+            lines indexed from 1)
+        """
+        numbered_content = {}
+        resume_lines = []
+        
+        for section_name, content in section_content.items():
+            numbered_lines = []
+            remaining_chars = _MAX_SECTION_CHARS
+            for line in content.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                
+                sanitized = self._sanitize_text_for_gpt(line)
+                resume_lines.append(line)
+                if len(sanitized) > remaining_chars:
+                    numbered_lines.append(
+                        f"{len(resume_lines):04d}| {sanitized[:remaining_chars]}... [truncated]"
+                    )
+                    break
+                
+                numbered_lines.append(f"{len(resume_lines):04d}| {sanitized}")
+                remaining_chars -= len(sanitized)
+            numbered_content[section_name] = "\n".join(numbered_lines)
+        
+        return numbered_content, resume_lines
+    
+    def _resolve_line_range(self, description: Any, resume_lines: Optional[List[str]]) -> Any:
+        """
+        Resolve a {"lines": [start, end]} pointer to the resume lines it covers.
+        
+        Args:
+            description: Description returned by GPT-4o, either text or a line range
+            resume_lines: Resume lines indexed from 1, as numbered in the prompt
+            
+        Returns:
+            List of resume lines for a valid range (an end past the last line is
+            clamped to it), "" for an invalid one, or the description unchanged if
+            it is already text
+        """
+        if not isinstance(description, dict):
+            return description
+        
+        line_range = description.get("lines")
+        if not resume_lines or not isinstance(line_range, list) or len(line_range) != 2:
+            return ""
+        
+        try:
+            start, end = int(line_range[0]), int(line_range[1])
+        except (TypeError, ValueError):
+            return ""
+        
+        # The schema cannot bound the numbers, so reject ranges that do not
+        # point into the resume instead of letting them slice from the end
+        end = min(end, len(resume_lines))
+        if not 1 <= start <= end:
+            return ""
+        
+        return resume_lines[start - 1:end]
+    
+    def _build_context_snippet(self, task: str, section_content: Dict[str, str]) -> Dict[str, str]:
+        """
+        Select the sections an extraction sub-task needs from the resume.
+        
+        Args:
+            task: Name of the sub-task in _EXTRACTION_TASKS
+            section_content: Dictionary mapping section names to their content
+            
+        Returns:
+            Dictionary with only the relevant sections, in resume order
+        """
+        relevant_sections = _EXTRACTION_TASK_SECTIONS[task]
+        if not any(section in section_content for section in relevant_sections):
+            return section_content
+        
+        return {
+            section_name: content
+            for section_name, content in section_content.items()
+            if section_name in relevant_sections or section_name == ResumeSection.UNKNOWN.value
+        }
+    
     def _create_system_prompt(self) -> str:
         """Create the system prompt for GPT-4o."""
         return """You are an expert resume parser and career analyst. Your task is to extract structured information from resume sections and infer implicit skills and qualifications.
 
 CRITICAL REQUIREMENTS:
-1. ALWAYS return data in the EXACT JSON schema format specified in the function definition
+1. ALWAYS return data in the EXACT JSON schema format specified in the response schema
 2. Infer implicit skills from technologies, frameworks, and projects mentioned
 3. For each skill, determine the most appropriate category (Technical, Programming, Framework, etc.)
 4. Calculate realistic experience estimates based on job history and project complexity
@@ -212,17 +751,13 @@ EXPERIENCE CALCULATION:
         Create the user prompt with resume content.
         
         Args:
-            section_content: Dictionary of section content
+            section_content: Dictionary of numbered section content, already
+                sanitized by _number_resume_lines
             parsed_doc: Parsed document metadata
             
         Returns:
             Formatted user prompt
         """
-        # Sanitize section content to prevent JSON issues
-        sanitized_content = {}
-        for section_name, content in section_content.items():
-            sanitized_content[section_name] = self._sanitize_text_for_gpt(content)
-        
         prompt_parts = [
             f"Please extract structured resume data from the following resume sections:",
             f"",
@@ -244,7 +779,7 @@ EXPERIENCE CALCULATION:
             f"RESUME SECTIONS:"
         ]
         
-        for section_name, content in sanitized_content.items():
+        for section_name, content in section_content.items():
             prompt_parts.extend([
                 f"",
                 f"=== {section_name.upper()} ===",
@@ -256,7 +791,8 @@ EXPERIENCE CALCULATION:
             f"EXTRACTION REQUIREMENTS:",
             f"1. Extract ALL contact information (name, email, phone, location)",
             f"2. Identify ALL skills mentioned AND infer related skills",
-            f"3. Extract complete work experience with accurate date ranges",
+            f"3. Extract complete work experience with accurate date ranges; give each role's",
+            f"   description as {{\"lines\": [start, end]}} using the line numbers shown, not copied text",
             f"4. Include all education and certifications",
             f"5. Calculate total experience and management experience",
             f"6. Provide a comprehensive professional summary",
@@ -346,7 +882,22 @@ EXPERIENCE CALCULATION:
                                 },
                                 "startDate": {"type": "string"},
                                 "endDate": {"type": "string"},
-                                "description": {"type": "string"}
+                                "description": {
+                                    "anyOf": [
+                                        {
+                                            "type": "object",
+                                            "properties": {
+                                                "lines": {
+                                                    "type": "array",
+                                                    "items": {"type": "integer"},
+                                                    "description": "First and last numbered resume line of the role's description"
+                                                }
+                                            },
+                                            "required": ["lines"]
+                                        },
+                                        {"type": "string"}
+                                    ]
+                                }
                             },
                             "required": ["jobTitle", "employer", "startDate", "endDate", "description"]
                         }
@@ -378,20 +929,110 @@ EXPERIENCE CALCULATION:
             }
         }
     
-    def _create_resume_schema(self, extracted_data: Dict[str, Any], parsed_doc: ParsedDocument) -> ResumeSchema:
+    def _create_task_function_schema(self, fields: List[str]) -> Dict[str, Any]:
+        """
+        Create a function schema limited to some of the top-level resume fields.
+        
+        Args:
+            fields: Top-level fields of the full schema to keep
+            
+        Returns:
+            Function schema for one extraction sub-task
+        """
+        parameters = self.function_schema["parameters"]
+        return {
+            "name": self.function_schema["name"],
+            "description": self.function_schema["description"],
+            "parameters": {
+                "type": "object",
+                "properties": {field: parameters["properties"][field] for field in fields},
+                "required": [field for field in parameters["required"] if field in fields]
+            }
+        }
+    
+    def _create_response_format(self, function_schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wrap a function schema as a strict JSON schema response format.
+        
+        With strict structured outputs the API guarantees the response matches
+        the schema, so malformed JSON and missing fields no longer need retries.
+        
+        Args:
+            function_schema: Function schema whose parameters describe the response
+            
+        Returns:
+            response_format argument for chat completions
+        """
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": function_schema["name"],
+                "description": function_schema["description"],
+                "strict": True,
+                "schema": self._make_schema_strict(function_schema["parameters"])
+            }
+        }
+    
+    def _make_schema_strict(self, schema: Dict[str, Any], nullable: bool = False) -> Dict[str, Any]:
+        """
+        Convert a JSON schema to the subset accepted by strict structured outputs.
+        
+        Strict mode requires every property to be listed as required and extra
+        properties to be disallowed, so properties that were optional become
+        nullable instead.
+        
+        Args:
+            schema: JSON schema to convert; it is not modified
+            nullable: Whether null is also an accepted value
+            
+        Returns:
+            Strict copy of the schema
+        """
+        schema = dict(schema)
+        
+        if "properties" in schema:
+            required = set(schema.get("required", []))
+            schema["properties"] = {
+                name: self._make_schema_strict(prop, nullable=name not in required)
+                for name, prop in schema["properties"].items()
+            }
+            schema["required"] = list(schema["properties"])
+            schema["additionalProperties"] = False
+        
+        if "items" in schema:
+            schema["items"] = self._make_schema_strict(schema["items"])
+        
+        if "anyOf" in schema:
+            schema["anyOf"] = [self._make_schema_strict(option) for option in schema["anyOf"]]
+            if nullable:
+                schema["anyOf"].append({"type": "null"})
+        elif nullable:
+            schema["type"] = [schema["type"], "null"]
+        
+        return schema
+    
+    def _create_resume_schema(
+        self,
+        extracted_data: Dict[str, Any],
+        parsed_doc: ParsedDocument,
+        section_content: Optional[Dict[str, str]] = None,
+        resume_lines: Optional[List[str]] = None
+    ) -> ResumeSchema:
         """
         Create ResumeSchema object from extracted data.
         
         Args:
             extracted_data: Data extracted by GPT-4o
             parsed_doc: Original parsed document
+            section_content: Section texts already prepared for the prompt
+            resume_lines: Numbered resume lines that description ranges point into
             
         Returns:
             ResumeSchema object
         """
         # Create contact info
         contact_data = extracted_data.get("contactInfo", {})
-        location_data = contact_data.get("location", {})
+        location_data = contact_data.get("location") or {}
         
         contact_info = ContactInfo(
             fullName=contact_data.get("fullName", ""),
@@ -408,22 +1049,41 @@ EXPERIENCE CALCULATION:
         
         # Create skills with automatic inference detection
         skills = []
-        resume_text = self._get_resume_text(parsed_doc)
+        resume_text = self._get_resume_text(parsed_doc, section_content)
         
         # Debug: print resume text to understand what's being extracted
         if settings.ENABLE_DEBUG_MODE:
             print(f"DEBUG: Resume text length: {len(resume_text)}")
             print(f"DEBUG: Resume text preview: {resume_text[:200]}")
         
+        # Scan the resume for inference trigger terms once instead of once per skill
+        present_triggers = {trigger for trigger in _INFERENCE_TRIGGERS if trigger in resume_text}
+        
+        # GPT can list the same skill twice (different casing or categories); keep the first
+        seen_skills = set()
+        
         for skill_data in extracted_data.get("skills", []):
             skill_name = skill_data.get("name", "")
             
+            skill_key = skill_name.lower()
+            if skill_key in seen_skills:
+                continue
+            seen_skills.add(skill_key)
+            
             # Automatically determine if skill is inferred by checking if it appears in resume text
-            is_inferred, inferred_from = self._detect_skill_inference(skill_name, resume_text, extracted_data)
+            is_inferred, inferred_from = self._detect_skill_inference(
+                skill_name, resume_text, extracted_data, present_triggers
+            )
+            
+            # Categories repeat across skills (and are grouped on in the UI), so
+            # intern them to share one string object per category
+            category = skill_data.get("category")
+            if category:
+                category = sys.intern(category)
             
             skill = Skill(
                 name=skill_name,
-                category=skill_data.get("category"),
+                category=category,
                 experienceInMonths=skill_data.get("experienceInMonths"),
                 lastUsed=skill_data.get("lastUsed"),
                 isInferred=is_inferred,
@@ -434,7 +1094,7 @@ EXPERIENCE CALCULATION:
         # Create education
         education = []
         for edu_data in extracted_data.get("education", []):
-            edu_location_data = edu_data.get("location", {})
+            edu_location_data = edu_data.get("location") or {}
             edu = Education(
                 schoolName=edu_data.get("schoolName", ""),
                 degreeName=edu_data.get("degreeName", ""),
@@ -451,7 +1111,7 @@ EXPERIENCE CALCULATION:
         # Create work experience
         work_experience = []
         for work_data in extracted_data.get("workExperience", []):
-            work_location_data = work_data.get("location", {})
+            work_location_data = work_data.get("location") or {}
             work = WorkExperience(
                 jobTitle=work_data.get("jobTitle", ""),
                 employer=work_data.get("employer", ""),
@@ -462,15 +1122,24 @@ EXPERIENCE CALCULATION:
                 ) if work_location_data else None,
                 startDate=work_data.get("startDate", ""),
                 endDate=work_data.get("endDate", ""),
-                description=work_data.get("description", "")
+                description=self._resolve_line_range(work_data.get("description", ""), resume_lines)
             )
             work_experience.append(work)
         
         # Create certifications
         certifications = []
+        seen_certifications = set()
         for cert_data in extracted_data.get("certifications", []):
+            cert_name = cert_data.get("name", "")
+            
+            # Skip certifications GPT listed more than once
+            cert_key = cert_name.lower()
+            if cert_key in seen_certifications:
+                continue
+            seen_certifications.add(cert_key)
+            
             cert = Certification(
-                name=cert_data.get("name", ""),
+                name=cert_name,
                 issuer=cert_data.get("issuer"),
                 issueDate=cert_data.get("issueDate")
             )
@@ -490,7 +1159,8 @@ EXPERIENCE CALCULATION:
             fileType=parsed_doc.file_type,
             fileExtension=parsed_doc.file_extension,
             revisionDate=datetime.now().isoformat(),
-            parserWarnings=parsed_doc.parsing_warnings,
+            # Drop repeated warnings while keeping the order they were raised in
+            parserWarnings=list(dict.fromkeys(parsed_doc.parsing_warnings)),
             culture=Culture(
                 language="en",
                 country="US",
@@ -512,34 +1182,26 @@ EXPERIENCE CALCULATION:
         
         return resume_schema
     
-    def _get_resume_text(self, parsed_doc: ParsedDocument) -> str:
+    def _get_resume_text(
+        self,
+        parsed_doc: ParsedDocument,
+        section_content: Optional[Dict[str, str]] = None
+    ) -> str:
         """
         Extract all text content from the parsed document.
         
         Args:
             parsed_doc: Parsed document
+            section_content: Section texts already prepared for the prompt, reused
+                so each section's elements are joined only once per extraction
             
         Returns:
             Combined text content from the resume
         """
-        text_parts = []
+        if section_content is None:
+            section_content = self._prepare_section_content(parsed_doc)
         
-        # Try to get text from grouped sections first
-        for section_group in parsed_doc.grouped_sections:
-            if section_group.combined_text:
-                text_parts.append(section_group.combined_text)
-            else:
-                # If combined_text is empty, extract from individual elements
-                for element in section_group.elements:
-                    if element.text:
-                        text_parts.append(element.text)
-        
-        # If no text found from sections, try to get from all elements directly
-        if not text_parts:
-            for section_group in parsed_doc.grouped_sections:
-                for element in section_group.elements:
-                    if element.text:
-                        text_parts.append(element.text)
+        text_parts = list(section_content.values())
         
         combined_text = " ".join(text_parts).lower()
         
@@ -560,7 +1222,13 @@ EXPERIENCE CALCULATION:
         
         return combined_text
     
-    def _detect_skill_inference(self, skill_name: str, resume_text: str, extracted_data: Dict[str, Any]) -> tuple[bool, str]:
+    def _detect_skill_inference(
+        self,
+        skill_name: str,
+        resume_text: str,
+        extracted_data: Dict[str, Any],
+        present_triggers: Optional[Set[str]] = None
+    ) -> tuple[bool, str]:
         """
         Automatically detect if a skill is inferred by checking if it appears in the resume text.
         
@@ -568,6 +1236,7 @@ EXPERIENCE CALCULATION:
             skill_name: Name of the skill to check
             resume_text: Full resume text content
             extracted_data: Extracted data from GPT-4o
+            present_triggers: Inference trigger terms already found in resume_text
             
         Returns:
             Tuple of (is_inferred, inferred_from)
@@ -576,138 +1245,35 @@ EXPERIENCE CALCULATION:
         
         # Check if skill name appears directly in resume text (more precise matching)
         # Look for exact matches or close variations
-        explicit_indicators = [
+        # (variants derive from the already-lowered name instead of re-lowering it)
+        explicit_indicators = (
             skill_lower,
-            skill_name.lower(),
-            skill_name.replace(" ", "").lower(),
-            skill_name.replace("-", "").lower()
-        ]
+            skill_lower.replace(" ", ""),
+            skill_lower.replace("-", "")
+        )
         
         for indicator in explicit_indicators:
             if indicator in resume_text:
                 return False, None
         
         # Also check for common variations
-        skill_variations = {
-            "javascript": ["js", "javascript"],
-            "python": ["python", "py"],
-            "react": ["react", "reactjs", "react.js"],
-            "node.js": ["node", "nodejs", "node.js"],
-            "postgresql": ["postgres", "postgresql"],
-            "mongodb": ["mongo", "mongodb"],
-        }
-        
-        if skill_lower in skill_variations:
-            for variation in skill_variations[skill_lower]:
+        if skill_lower in _SKILL_VARIATIONS:
+            for variation in _SKILL_VARIATIONS[skill_lower]:
                 if variation in resume_text:
                     return False, None
         
-        # Define inference rules based on what's in the resume
-        inference_rules = {
-            # Technical stack inferences
-            "data analysis": ["python", "analytics", "data"],
-            "problem solving": ["engineer", "developer", "software", "technical"],
-            "object-oriented programming": ["python", "java", "c++", "oop"],
-            "html": ["react", "javascript", "web", "frontend", "ui"],
-            "css": ["react", "javascript", "web", "frontend", "ui"],
-            "dom manipulation": ["javascript", "react", "frontend"],
-            "debugging": ["developer", "engineer", "programming", "software"],
-            "component architecture": ["react", "frontend", "ui"],
-            "state management": ["react", "frontend", "javascript"],
-            "backend development": ["node.js", "django", "flask", "api", "server"],
-            "api development": ["backend", "rest", "node.js", "django", "flask"],
-            "cloud architecture": ["aws", "gcp", "cloud", "azure"],
-            "scalability": ["aws", "cloud", "microservices", "architecture"],
-            "infrastructure management": ["aws", "cloud", "devops", "docker"],
-            
-            # Role-based inferences
-            "mentoring": ["senior", "lead", "mentor"],
-            "code review": ["senior", "lead", "engineer"],
-            "technical leadership": ["senior", "lead", "architect"],
-            "project management": ["lead", "manager", "project"],
-            "team coordination": ["lead", "manager", "team"],
-            "technical decision making": ["lead", "senior", "architect"],
-            "technical documentation": ["engineer", "developer", "technical"],
-            "testing": ["engineer", "developer", "qa", "software"],
-            
-            # Experience-based inferences
-            "collaboration": ["team", "agile", "cross-functional"],
-            "agile methodologies": ["agile", "sprint", "scrum"],
-            "version control": ["git", "github", "development"],
-            "software development lifecycle": ["developer", "engineer", "software"],
-            
-            # Education-based inferences
-            "algorithms": ["computer science", "cs", "engineering"],
-            "data structures": ["computer science", "cs", "programming"],
-            "software engineering principles": ["computer science", "cs", "engineering"],
-        }
-        
         # Check if skill can be inferred from resume content
-        if skill_lower in inference_rules:
-            triggers = inference_rules[skill_lower]
+        triggers = _SKILL_INFERENCE_RULES.get(skill_lower)
+        if triggers:
+            if present_triggers is None:
+                present_triggers = {trigger for trigger in triggers if trigger in resume_text}
             for trigger in triggers:
-                if trigger in resume_text:
+                if trigger in present_triggers:
                     return True, f"{trigger.title()} experience"
         
         # Default: assume it's inferred if not found in text
         return True, "Professional experience context"
     
-    def _build_skill_inference_database(self) -> Dict[str, List[str]]:
-        """
-        Build a database of skill inferences for comprehensive skill extraction.
-        
-        Returns:
-            Dictionary mapping technologies to inferred skills
-        """
-        return {
-            # Web Frameworks → Languages & Skills
-            "streamlit": ["Python", "Web Development", "Data Visualization", "Dashboard Development"],
-            "django": ["Python", "Web Development", "Backend Development", "MVC Architecture", "ORM"],
-            "flask": ["Python", "Web Development", "Backend Development", "REST APIs", "Microservices"],
-            "react": ["JavaScript", "Frontend Development", "HTML", "CSS", "Component Architecture", "SPA"],
-            "angular": ["TypeScript", "JavaScript", "Frontend Development", "HTML", "CSS", "SPA"],
-            "vue": ["JavaScript", "Frontend Development", "HTML", "CSS", "Component Architecture"],
-            "node.js": ["JavaScript", "Backend Development", "Server-side Development", "npm"],
-            "express": ["JavaScript", "Node.js", "Backend Development", "REST APIs", "Web Servers"],
-            
-            # Cloud Platforms → DevOps & Infrastructure
-            "aws": ["Cloud Computing", "DevOps", "Infrastructure", "Scalability", "EC2", "S3"],
-            "azure": ["Cloud Computing", "DevOps", "Infrastructure", "Microsoft Technologies"],
-            "gcp": ["Cloud Computing", "DevOps", "Infrastructure", "Google Technologies"],
-            "docker": ["Containerization", "DevOps", "Linux", "Deployment", "Microservices"],
-            "kubernetes": ["Container Orchestration", "DevOps", "Scalability", "Microservices", "Linux"],
-            
-            # Databases → Data Skills
-            "postgresql": ["SQL", "Database Design", "Relational Databases", "Data Modeling"],
-            "mysql": ["SQL", "Database Design", "Relational Databases", "Data Modeling"],
-            "mongodb": ["NoSQL", "Database Design", "Document Databases", "JSON"],
-            "redis": ["Caching", "In-memory Databases", "Performance Optimization"],
-            
-            # Data Science & ML → Analytics Skills
-            "pandas": ["Python", "Data Analysis", "Data Manipulation", "Statistics"],
-            "numpy": ["Python", "Scientific Computing", "Mathematical Computing", "Data Analysis"],
-            "scikit-learn": ["Machine Learning", "Python", "Data Science", "Predictive Modeling"],
-            "tensorflow": ["Machine Learning", "Deep Learning", "Python", "AI", "Neural Networks"],
-            "pytorch": ["Machine Learning", "Deep Learning", "Python", "AI", "Neural Networks"],
-            
-            # Mobile Development
-            "react native": ["Mobile Development", "JavaScript", "Cross-platform Development", "iOS", "Android"],
-            "flutter": ["Mobile Development", "Dart", "Cross-platform Development", "iOS", "Android"],
-            "swift": ["iOS Development", "Mobile Development", "Apple Ecosystem"],
-            "kotlin": ["Android Development", "Mobile Development", "JVM Languages"],
-            
-            # DevOps & Tools
-            "jenkins": ["CI/CD", "DevOps", "Automation", "Build Pipelines"],
-            "git": ["Version Control", "Collaboration", "Source Code Management"],
-            "github": ["Version Control", "Collaboration", "Open Source", "Git"],
-            "gitlab": ["Version Control", "CI/CD", "DevOps", "Git"],
-            
-            # Testing
-            "pytest": ["Python", "Testing", "Test Automation", "Quality Assurance"],
-            "jest": ["JavaScript", "Testing", "Frontend Testing", "Unit Testing"],
-            "selenium": ["Test Automation", "Web Testing", "Quality Assurance"],
-        }
-    
     def get_extraction_stats(self, resume_schema: ResumeSchema) -> Dict[str, Any]:
         """
         Get statistics about the extracted resume data.
@@ -726,31 +1292,48 @@ EXPERIENCE CALCULATION:
             "total_experience_months": resume_schema.experienceSummary.totalMonthsExperience,
         }
     
-    def _count_input_tokens(self, system_prompt: str, user_prompt: str, function_schema: dict) -> int:
+    def _count_static_input_tokens(self, response_format: Dict[str, Any]) -> int:
         """
-        Count tokens for input messages and function schema.
+        Count tokens for the parts of the input that are the same for every document.
         
         Args:
-            system_prompt: System prompt text
-            user_prompt: User prompt text
-            function_schema: Function calling schema
+            response_format: JSON schema response format sent with the request
             
         Returns:
-            Total input token count
+            Token count for the system prompt, response schema and message overhead
         """
         try:
-            # Count tokens for messages
-            system_tokens = len(self.tokenizer.encode(system_prompt))
-            user_tokens = len(self.tokenizer.encode(user_prompt))
+            # Count tokens for the system prompt
+            system_tokens = len(self.tokenizer.encode(self.system_prompt))
             
-            # Count tokens for function schema (convert to string)
-            schema_text = json.dumps(function_schema)
+            # Count tokens for the response schema (convert to string)
+            schema_text = json.dumps(response_format)
             schema_tokens = len(self.tokenizer.encode(schema_text))
             
             # Add overhead for message formatting (approximate)
             message_overhead = 10  # Tokens for message structure
             
-            return system_tokens + user_tokens + schema_tokens + message_overhead
+            return system_tokens + schema_tokens + message_overhead
+        except Exception as e:
+            print(f"Error counting input tokens: {e}")
+            return 0
+    
+    def _count_input_tokens(self, task: str, user_prompt: str) -> int:
+        """
+        Count tokens for input messages and response schema.
+        
+        Args:
+            task: Extraction sub-task the prompt is sent for
+            user_prompt: User prompt text
+            
+        Returns:
+            Total input token count
+        """
+        try:
+            # Only the user prompt varies; the rest was counted at init
+            user_tokens = len(self.tokenizer.encode(user_prompt))
+            
+            return self.task_static_input_tokens[task] + user_tokens
         except Exception as e:
             print(f"Error counting input tokens: {e}")
             return 0
@@ -771,79 +1354,60 @@ EXPERIENCE CALCULATION:
             print(f"Error counting output tokens: {e}")
             return 0
     
-    def _track_token_usage(self, input_tokens: int, output_tokens: int, response) -> None:
+    def _resolve_token_counts(self, input_tokens: int, output_tokens: int, response) -> Tuple[int, int, int]:
         """
-        Track token usage and calculate costs.
+        Prefer API-reported token counts over local estimates.
         
         Args:
-            input_tokens: Number of input tokens
-            output_tokens: Number of output tokens
+            input_tokens: Locally counted input tokens
+            output_tokens: Locally counted output tokens
             response: OpenAI API response object
+            
+        Returns:
+            Tuple of (input_tokens, output_tokens, cached_tokens)
         """
-        try:
-            # Get usage from response if available
-            api_usage = getattr(response, 'usage', None)
+        # Get usage from response if available
+        api_usage = getattr(response, 'usage', None)
+        
+        # Use API-reported tokens if available, otherwise use our counts
+        if api_usage:
+            actual_input_tokens = getattr(api_usage, 'prompt_tokens', input_tokens)
+            actual_output_tokens = getattr(api_usage, 'completion_tokens', output_tokens)
             
-            # Use API-reported tokens if available, otherwise use our counts
-            if api_usage:
-                actual_input_tokens = getattr(api_usage, 'prompt_tokens', input_tokens)
-                actual_output_tokens = getattr(api_usage, 'completion_tokens', output_tokens)
-                
-                # Handle cached tokens safely
-                prompt_details = getattr(api_usage, 'prompt_tokens_details', None)
-                if prompt_details and hasattr(prompt_details, 'cached_tokens'):
-                    cached_tokens = prompt_details.cached_tokens
-                else:
-                    cached_tokens = 0
+            # Handle cached tokens safely
+            prompt_details = getattr(api_usage, 'prompt_tokens_details', None)
+            if prompt_details and hasattr(prompt_details, 'cached_tokens'):
+                cached_tokens = prompt_details.cached_tokens or 0
             else:
-                actual_input_tokens = input_tokens
-                actual_output_tokens = output_tokens
                 cached_tokens = 0
-            
-            # Create token usage record
-            usage = TokenUsage(
-                input_tokens=actual_input_tokens,
-                output_tokens=actual_output_tokens,
-                cached_input_tokens=cached_tokens,
-                model_name=self.model,
-                timestamp=datetime.now()
-            )
-            
-            # Add to tracker
-            self.token_tracker.add_usage(usage)
-            
-        except Exception as e:
-            print(f"Error tracking token usage: {e}")
-    
-    def get_token_usage(self) -> Optional[TokenUsage]:
-        """
-        Get current session token usage.
+        else:
+            actual_input_tokens = input_tokens
+            actual_output_tokens = output_tokens
+            cached_tokens = 0
         
-        Returns:
-            TokenUsage object or None if no usage tracked
-        """
-        return self.token_tracker.get_current_usage()
+        return actual_input_tokens, actual_output_tokens, cached_tokens
     
-    def get_total_token_usage(self) -> TokenUsage:
+    def _create_token_usage(self, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> TokenUsage:
         """
-        Get total cumulative token usage.
+        Create a token usage record for one extraction.
         
+        Args:
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            cached_tokens: Number of cached input tokens
+            
         Returns:
-            TokenUsage object with cumulative statistics
-        """
-        return self.token_tracker.get_total_usage()
-    
-    def reset_token_tracking(self) -> None:
-        """
-        Reset token usage tracking for new session.
-        """
-        self.token_tracker.reset_session()
-    
-    def clear_token_history(self) -> None:
+            TokenUsage object with costs calculated
         """
-        Clear all token usage history.
-        """
-        self.token_tracker.clear_history()
+        usage = TokenUsage(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_input_tokens=cached_tokens,
+            model_name=self.model,
+            timestamp=datetime.now()
+        )
+        usage.calculate_costs()
+        return usage
     
     def _fix_json_string(self, json_string: str) -> str:
         """
@@ -879,35 +1443,21 @@ EXPERIENCE CALCULATION:
         
         # Fix unescaped quotes in string values
         # This is a simplified approach - we'll escape quotes that are inside string values
-        import re
-        
-        # Pattern to match string values and escape quotes within them
         def escape_quotes_in_strings(match):
             content = match.group(1)
             # Escape any unescaped quotes
             content = content.replace('"', '\\"')
             return f'"{content}"'
         
-        # This regex matches string values in JSON
-        # It looks for quoted strings and handles nested quotes
-        pattern = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
-        json_object = re.sub(pattern, escape_quotes_in_strings, json_object)
+        json_object = _JSON_STRING_RE.sub(escape_quotes_in_strings, json_object)
         
         # Remove trailing commas before closing braces/brackets
-        json_object = re.sub(r',(\s*[}\]])', r'\1', json_object)
+        json_object = _TRAILING_COMMA_RE.sub(r'\1', json_object)
         
         # Fix missing quotes around property names
-        # This is a more complex fix - we'll look for unquoted property names
-        def fix_unquoted_properties(match):
-            property_name = match.group(1)
-            # Only fix if it looks like a valid property name
-            if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', property_name):
-                return f'"{property_name}":'
-            return match.group(0)
-        
-        # Pattern to find unquoted property names
-        property_pattern = r'([a-zA-Z_][a-zA-Z0-9_]*)\s*:'
-        json_object = re.sub(property_pattern, fix_unquoted_properties, json_object)
+        # The pattern only captures valid identifiers, so a plain template
+        # replacement is enough and no per-match callback or re-match is needed
+        json_object = _UNQUOTED_PROPERTY_RE.sub(r'"\1":', json_object)
         
         return json_object
     
@@ -924,25 +1474,12 @@ EXPERIENCE CALCULATION:
         if not text:
             return ""
         
-        # Replace problematic characters that could break JSON
-        sanitized = text
-        
-        # Replace unescaped quotes with escaped quotes
-        sanitized = sanitized.replace('"', '\\"')
-        
-        # Replace newlines with spaces to prevent JSON structure issues
-        sanitized = sanitized.replace('\n', ' ')
-        sanitized = sanitized.replace('\r', ' ')
-        
-        # Replace tabs with spaces
-        sanitized = sanitized.replace('\t', ' ')
-        
-        # Remove multiple consecutive spaces
-        import re
-        sanitized = re.sub(r'\s+', ' ', sanitized)
+        # Escape quotes, then collapse newlines, tabs and repeated spaces
+        # into single spaces in one pass to prevent JSON structure issues
+        sanitized = _WHITESPACE_RE.sub(' ', text.replace('"', '\\"'))
         
         # Truncate if too long (to prevent token limit issues)
-        if len(sanitized) > 8000:
-            sanitized = sanitized[:8000] + "... [truncated]"
+        if len(sanitized) > _MAX_SECTION_CHARS:
+            sanitized = sanitized[:_MAX_SECTION_CHARS] + "... [truncated]"
         
         return sanitized.strip()
@@ -8,6 +8,25 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, validator
 import re
 
+# Every parseable date below contains a four digit year
+_YEAR_RE = re.compile(r'\d{4}')
+
+# Month name + year (e.g., "January 2023", "Jan 2023") with their strptime formats
+_MONTH_YEAR_PATTERNS = [
+    (re.compile(r'(\w+)\s+(\d{4})'), '%B %Y'),  # January 2023
+    (re.compile(r'(\w{3})\s+(\d{4})'), '%b %Y'),  # Jan 2023
+]
+
+# Season + year (e.g., "Spring 2023") mapped to a representative month
+_SEASON_YEAR_RE = re.compile(r'(spring|summer|fall|autumn|winter)\s+(\d{4})')
+_SEASON_MONTHS = {
+    'spring': 3,   # Spring -> March
+    'summer': 6,   # Summer -> June
+    'fall': 9,     # Fall -> September
+    'autumn': 9,   # Autumn -> September
+    'winter': 12,  # Winter -> December
+}
+
 def parse_flexible_date(date_str: str) -> Optional[str]:
     """
     Parse various date formats commonly found in resumes.
@@ -33,6 +52,10 @@ def parse_flexible_date(date_str: str) -> Optional[str]:
     if date_str in unknown_variations:
         return None
     
+    # Without a year none of the formats below can match
+    if not _YEAR_RE.search(date_str):
+        return None
+    
     # Try YYYY-MM-DD format
     try:
         parsed_date = datetime.strptime(date_str, '%Y-%m-%d')
@@ -55,14 +78,8 @@ def parse_flexible_date(date_str: str) -> Optional[str]:
         pass
     
     # Try month names (e.g., "January 2023", "Jan 2023")
-    month_patterns = [
-        (r'(\w+)\s+(\d{4})', '%B %Y'),  # January 2023
-        (r'(\w{3})\s+(\d{4})', '%b %Y'),  # Jan 2023
-    ]
-    
-    for pattern, format_str in month_patterns:
-        match = re.match(pattern, date_str, re.IGNORECASE)
-        if match:
+    for pattern, format_str in _MONTH_YEAR_PATTERNS:
+        if pattern.match(date_str):
             try:
                 parsed_date = datetime.strptime(date_str, format_str)
                 return parsed_date.strftime('%Y-%m')
@@ -70,19 +87,10 @@ def parse_flexible_date(date_str: str) -> Optional[str]:
                 continue
     
     # Try season + year (e.g., "Spring 2023")
-    season_patterns = [
-        (r'spring\s+(\d{4})', 3),   # Spring -> March
-        (r'summer\s+(\d{4})', 6),   # Summer -> June
-        (r'fall\s+(\d{4})', 9),     # Fall -> September
-        (r'autumn\s+(\d{4})', 9),   # Autumn -> September
-        (r'winter\s+(\d{4})', 12),  # Winter -> December
-    ]
-    
-    for pattern, month in season_patterns:
-        match = re.match(pattern, date_str, re.IGNORECASE)
-        if match:
-            year = int(match.group(1))
-            return f"{year:04d}-{month:02d}"
+    match = _SEASON_YEAR_RE.match(date_str)
+    if match:
+        year = int(match.group(2))
+        return f"{year:04d}-{_SEASON_MONTHS[match.group(1)]:02d}"
     
     return None
 
@@ -112,6 +120,11 @@ class Location(BaseModel):
     city: Optional[str] = None
     state: Optional[str] = None
     country: Optional[str] = None
+    
+    @property
+    def formatted(self) -> str:
+        """Location parts that are set, joined for display (e.g. "Austin, TX, USA")."""
+        return ", ".join(part for part in (self.city, self.state, self.country) if part)
 
 
 class ContactInfo(BaseModel):
@@ -170,6 +183,13 @@ class WorkExperience(BaseModel):
     endDate: str = Field(description="Date in YYYY-MM format or 'current'")
     description: str
     
+    @validator('description', pre=True)
+    def validate_description(cls, v):
+        """Accept either text or the resume lines a description range resolved to."""
+        if isinstance(v, list):
+            return "\n".join(str(line) for line in v)
+        return v
+    
     @validator('startDate')
     def validate_start_date(cls, v):
         parsed_date = parse_flexible_date(v)
@@ -16,13 +16,144 @@ from src.models.resume_elements import (
 )
 
 
+# Regex patterns for detecting resume section headers
+_SECTION_PATTERNS: Dict[ResumeSection, List[str]] = {
+    ResumeSection.CONTACT: [
+        r'^contact\s*(information|info|details)?$',
+        r'^personal\s*(information|info|details)$',
+        r'^contact\s*me$'
+    ],
+    ResumeSection.SUMMARY: [
+        r'^(professional\s*)?summary$',
+        r'^(career\s*)?summary$',
+        r'^profile$',
+        r'^overview$',
+        r'^about\s*(me)?$',
+        r'^executive\s*summary$'
+    ],
+    ResumeSection.OBJECTIVE: [
+        r'^(career\s*)?objective$',
+        r'^goal$',
+        r'^career\s*goal$'
+    ],
+    ResumeSection.SKILLS: [
+        r'^(technical\s*)?skills$',
+        r'^core\s*competencies$',
+        r'^competencies$',
+        r'^expertise$',
+        r'^technologies$',
+        r'^programming\s*languages$',
+        r'^tools\s*(and\s*technologies)?$'
+    ],
+    ResumeSection.EXPERIENCE: [
+        r'^(work\s*|professional\s*)?experience$',
+        r'^employment\s*history$',
+        r'^career\s*history$',
+        r'^work\s*history$',
+        r'^professional\s*background$'
+    ],
+    ResumeSection.EDUCATION: [
+        r'^education$',
+        r'^academic\s*background$',
+        r'^educational\s*background$',
+        r'^qualifications$',
+        r'^academic\s*qualifications$'
+    ],
+    ResumeSection.CERTIFICATIONS: [
+        r'^certifications?$',
+        r'^certificates?$',
+        r'^professional\s*certifications?$',
+        r'^licenses?\s*(and\s*certifications?)?$'
+    ],
+    ResumeSection.PROJECTS: [
+        r'^projects?$',
+        r'^key\s*projects?$',
+        r'^notable\s*projects?$',
+        r'^selected\s*projects?$'
+    ],
+    ResumeSection.AWARDS: [
+        r'^awards?$',
+        r'^honors?\s*(and\s*awards?)?$',
+        r'^achievements?$',
+        r'^recognition$'
+    ],
+    ResumeSection.REFERENCES: [
+        r'^references?$',
+        r'^professional\s*references?$',
+        r'^references?\s*available\s*upon\s*request$'
+    ]
+}
+
+# Regex patterns for detecting contact information
+_CONTACT_PATTERNS: List[str] = [
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email
+    r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # Phone (US format)
+    r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',  # Phone (US format with parentheses)
+    r'\+\d{1,3}[-.\s]?\d{1,14}',  # International phone
+    r'\b\d{1,5}\s+\w+\s+(street|st|avenue|ave|road|rd|drive|dr|lane|ln|boulevard|blvd)',  # Address
+    r'\b(linkedin\.com/in/|github\.com/|twitter\.com/)',  # Social profiles
+]
+
+# Element types that can start a section, and those that always carry contact info
+_HEADER_ELEMENT_TYPES = frozenset({ElementType.TITLE, ElementType.HEADER})
+_CONTACT_ELEMENT_TYPES = frozenset({
+    ElementType.EMAIL_ADDRESS,
+    ElementType.PHONE_NUMBER,
+    ElementType.ADDRESS
+})
+
+
+def _build_header_lookup(section_patterns: Dict[ResumeSection, List[str]]) -> Dict[str, ResumeSection]:
+    """
+    Build an exact-match lookup for section patterns that are plain words.
+    
+    Args:
+        section_patterns: Dictionary mapping sections to regex patterns
+        
+    Returns:
+        Dictionary mapping literal header text to its resume section
+    """
+    header_lookup = {}
+    for section, patterns in section_patterns.items():
+        for pattern in patterns:
+            literal = pattern.strip('^$')
+            if re.escape(literal) == literal:
+                header_lookup.setdefault(literal, section)
+    
+    return header_lookup
+
+
+# Plain one-word headers resolve with a single dictionary lookup
+_HEADER_LOOKUP = _build_header_lookup(_SECTION_PATTERNS)
+
+# Compile every pattern once at import; matching runs for each document element.
+# All sections are merged into one alternation with a named group per section, in
+# the same order as _SECTION_PATTERNS, so the first section that matches still wins.
+_COMPILED_SECTION_PATTERN = re.compile(
+    '|'.join(
+        f'(?P<{section.name}>' + '|'.join(f'(?:{pattern})' for pattern in patterns) + ')'
+        for section, patterns in _SECTION_PATTERNS.items()
+    ),
+    re.IGNORECASE
+)
+
+# Contact patterns are fused so each element's text is scanned only once
+_COMPILED_CONTACT_PATTERN = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in _CONTACT_PATTERNS), re.IGNORECASE
+)
+
+
 class ContentProcessor:
     """Processes document elements and groups them into resume sections."""
     
     def __init__(self):
         """Initialize the content processor with section patterns."""
-        self.section_patterns = self._build_section_patterns()
-        self.contact_patterns = self._build_contact_patterns()
+        # Patterns are compiled once at import and shared by every instance
+        self.section_patterns = _SECTION_PATTERNS
+        self.contact_patterns = _CONTACT_PATTERNS
+        self.header_lookup = _HEADER_LOOKUP
+        self.compiled_section_pattern = _COMPILED_SECTION_PATTERN
+        self.compiled_contact_pattern = _COMPILED_CONTACT_PATTERN
     
     def process_document(self, parsed_doc: ParsedDocument, elements: List[DocumentElement]) -> ParsedDocument:
         """
@@ -104,17 +235,22 @@ class ContentProcessor:
         Returns:
             Detected resume section
         """
+        # Only consider titles and headers for section detection; the element
+        # type from unstructured is enough to rule out everything else
+        if element.element_type not in _HEADER_ELEMENT_TYPES:
+            return ResumeSection.UNKNOWN
+        
         text = element.text.lower().strip()
         
-        # Only consider titles and headers for section detection
-        if element.element_type not in [ElementType.TITLE, ElementType.HEADER]:
-            return ResumeSection.UNKNOWN
+        # Plain one-word headers resolve with a single dictionary lookup
+        section = self.header_lookup.get(text)
+        if section is not None:
+            return section
         
-        # Check against section patterns
-        for section, patterns in self.section_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return section
+        # Check against section patterns in a single search
+        match = self.compiled_section_pattern.search(text)
+        if match:
+            return ResumeSection[match.lastgroup]
         
         return ResumeSection.UNKNOWN
     
@@ -129,17 +265,11 @@ class ContentProcessor:
             True if element contains contact info
         """
         # Direct element types
-        if element.element_type in [ElementType.EMAIL_ADDRESS, ElementType.PHONE_NUMBER, ElementType.ADDRESS]:
+        if element.element_type in _CONTACT_ELEMENT_TYPES:
             return True
         
-        text = element.text
-        
-        # Check for contact patterns
-        for pattern in self.contact_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        
-        return False
+        # Check for contact patterns in a single pass over the text
+        return self.compiled_contact_pattern.search(element.text) is not None
     
     def _calculate_section_confidence(self, section: ResumeSection, elements: List[DocumentElement]) -> float:
         """
@@ -158,121 +288,31 @@ class ContentProcessor:
         # Base confidence
         confidence = 0.5
         
+        # Collect element types in a single pass; every boost below is a set lookup
+        element_types = {elem.element_type for elem in elements}
+        
         # Boost confidence for sections with clear headers
-        has_header = any(
-            elem.element_type in [ElementType.TITLE, ElementType.HEADER]
-            for elem in elements
-        )
+        has_header = not _HEADER_ELEMENT_TYPES.isdisjoint(element_types)
         if has_header:
             confidence += 0.3
         
         # Boost confidence for contact section with structured data
         if section == ResumeSection.CONTACT:
-            has_structured_contact = any(
-                elem.element_type in [ElementType.EMAIL_ADDRESS, ElementType.PHONE_NUMBER]
-                for elem in elements
+            has_structured_contact = (
+                ElementType.EMAIL_ADDRESS in element_types or
+                ElementType.PHONE_NUMBER in element_types
             )
             if has_structured_contact:
                 confidence += 0.2
         
         # Boost confidence for sections with appropriate content types
         if section == ResumeSection.SKILLS:
-            has_lists = any(elem.element_type == ElementType.LIST_ITEM for elem in elements)
+            has_lists = ElementType.LIST_ITEM in element_types
             if has_lists:
                 confidence += 0.2
         
         return min(confidence, 1.0)
     
-    def _build_section_patterns(self) -> Dict[ResumeSection, List[str]]:
-        """
-        Build regex patterns for detecting resume sections.
-        
-        Returns:
-            Dictionary mapping sections to regex patterns
-        """
-        return {
-            ResumeSection.CONTACT: [
-                r'^contact\s*(information|info|details)?$',
-                r'^personal\s*(information|info|details)$',
-                r'^contact\s*me$'
-            ],
-            ResumeSection.SUMMARY: [
-                r'^(professional\s*)?summary$',
-                r'^(career\s*)?summary$',
-                r'^profile$',
-                r'^overview$',
-                r'^about\s*(me)?$',
-                r'^executive\s*summary$'
-            ],
-            ResumeSection.OBJECTIVE: [
-                r'^(career\s*)?objective$',
-                r'^goal$',
-                r'^career\s*goal$'
-            ],
-            ResumeSection.SKILLS: [
-                r'^(technical\s*)?skills$',
-                r'^core\s*competencies$',
-                r'^competencies$',
-                r'^expertise$',
-                r'^technologies$',
-                r'^programming\s*languages$',
-                r'^tools\s*(and\s*technologies)?$'
-            ],
-            ResumeSection.EXPERIENCE: [
-                r'^(work\s*|professional\s*)?experience$',
-                r'^employment\s*history$',
-                r'^career\s*history$',
-                r'^work\s*history$',
-                r'^professional\s*background$'
-            ],
-            ResumeSection.EDUCATION: [
-                r'^education$',
-                r'^academic\s*background$',
-                r'^educational\s*background$',
-                r'^qualifications$',
-                r'^academic\s*qualifications$'
-            ],
-            ResumeSection.CERTIFICATIONS: [
-                r'^certifications?$',
-                r'^certificates?$',
-                r'^professional\s*certifications?$',
-                r'^licenses?\s*(and\s*certifications?)?$'
-            ],
-            ResumeSection.PROJECTS: [
-                r'^projects?$',
-                r'^key\s*projects?$',
-                r'^notable\s*projects?$',
-                r'^selected\s*projects?$'
-            ],
-            ResumeSection.AWARDS: [
-                r'^awards?$',
-                r'^honors?\s*(and\s*awards?)?$',
-                r'^achievements?$',
-                r'^recognition$'
-            ],
-            ResumeSection.REFERENCES: [
-                r'^references?$',
-                r'^professional\s*references?$',
-                r'^references?\s*available\s*upon\s*request$'
-            ]
-        }
-    
-    def _build_contact_patterns(self) -> List[str]:
-        """
-        Build regex patterns for detecting contact information.
-        
-        Returns:
-            List of regex patterns for contact info
-        """
-        return [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # Phone (US format)
-            r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',  # Phone (US format with parentheses)
-            r'\+\d{1,3}[-.\s]?\d{1,14}',  # International phone
-            r'\b\d{1,5}\s+\w+\s+(street|st|avenue|ave|road|rd|drive|dr|lane|ln|boulevard|blvd)',  # Address
-            r'\b(linkedin\.com/in/|github\.com/|twitter\.com/)',  # Social profiles
-        ]
-    
     def _validate_sections(self, parsed_doc: ParsedDocument) -> None:
         """
         Validate grouped sections and add warnings for missing critical sections.
@@ -311,22 +351,15 @@ class ContentProcessor:
         Returns:
             Dictionary with section statistics
         """
-        summary = {
-            'total_sections': len(grouped_sections),
-            'sections_found': [],
-            'element_counts': {},
-            'average_confidence': 0.0
+        element_counts = {
+            section_group.section.value: len(section_group.elements)
+            for section_group in grouped_sections
         }
+        total_confidence = sum(section_group.confidence for section_group in grouped_sections)
         
-        total_confidence = 0.0
-        
-        for section_group in grouped_sections:
-            section_name = section_group.section.value
-            summary['sections_found'].append(section_name)
-            summary['element_counts'][section_name] = len(section_group.elements)
-            total_confidence += section_group.confidence
-        
-        if grouped_sections:
-            summary['average_confidence'] = total_confidence / len(grouped_sections)
-        
-        return summary
+        return {
+            'total_sections': len(grouped_sections),
+            'sections_found': list(element_counts),
+            'element_counts': element_counts,
+            'average_confidence': total_confidence / len(grouped_sections) if grouped_sections else 0.0
+        }
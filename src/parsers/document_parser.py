@@ -4,11 +4,13 @@ Handles multiple file formats and converts them into DocumentElement objects.
 """
 
 import io
-import tempfile
+import re
 import os
-from typing import List, Dict, Any, Optional, Union
+from collections import Counter
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 from pathlib import Path
 
+from charset_normalizer import from_bytes
 from unstructured.partition.auto import partition
 from unstructured.documents.elements import Element
 
@@ -19,6 +21,51 @@ from src.models.resume_elements import (
     ResumeSection
 )
 
+# Character classes used to spot phone numbers during fallback line classification
+_DIGIT_CHARS = frozenset('0123456789')
+_PHONE_PUNCTUATION = frozenset('()-')
+
+# A run of characters up to the next newline, used to walk fallback text line by line
+_LINE_RE = re.compile(r'[^\n]+')
+
+# Bullet characters that mark a list item during fallback line classification
+_BULLET_PREFIXES = ('•', '-', '*')
+
+# Unstructured element categories mapped to our ElementType enum
+_CATEGORY_MAPPING = {
+    'Title': ElementType.TITLE,
+    'NarrativeText': ElementType.NARRATIVE_TEXT,
+    'ListItem': ElementType.LIST_ITEM,
+    'Table': ElementType.TABLE,
+    'Header': ElementType.HEADER,
+    'Footer': ElementType.FOOTER,
+    'EmailAddress': ElementType.EMAIL_ADDRESS,
+    'Address': ElementType.ADDRESS,
+    'PhoneNumber': ElementType.PHONE_NUMBER,
+    'UncategorizedText': ElementType.NARRATIVE_TEXT,  # Fallback
+    'Text': ElementType.NARRATIVE_TEXT,  # Fallback
+}
+
+# Human-readable file types by extension
+_FILE_TYPE_MAPPING = {
+    '.pdf': 'PDF Document',
+    '.docx': 'Word Document (DOCX)',
+    '.doc': 'Word Document (DOC)',
+    '.txt': 'Text Document',
+    '.html': 'HTML Document',
+    '.htm': 'HTML Document'
+}
+
+# Section-header keywords for fallback line classification, fused into one
+# case-insensitive pattern so each line is scanned once without a lowercased copy
+_FALLBACK_HEADER_RE = re.compile('|'.join([
+    'summary', 'objective', 'profile', 'about',
+    'experience', 'work', 'employment', 'career',
+    'education', 'academic', 'degree', 'university',
+    'skills', 'competencies', 'expertise', 'technologies',
+    'certifications', 'certificates', 'licenses'
+]), re.IGNORECASE)
+
 
 class DocumentParser:
     """Handles document parsing using the unstructured library."""
@@ -26,6 +73,13 @@ class DocumentParser:
     def __init__(self):
         """Initialize the document parser."""
         self.supported_extensions = {'.pdf', '.docx', '.doc', '.txt', '.html', '.htm'}
+        
+        # Fallback extractors by extension, with the warning recorded on success
+        self._fallback_extractors = {
+            '.txt': (self._extract_text_elements, "Document parsed successfully using text extraction"),
+            '.pdf': (self._extract_pdf_elements, "Document parsed successfully using PDF text extraction"),
+            '.docx': (self._extract_docx_elements, "Document parsed successfully using Word document extraction"),
+        }
     
     def parse_document(
         self,
@@ -48,61 +102,47 @@ class DocumentParser:
         file_type = self._get_file_type(file_extension)
         
         try:
-            # Create temporary file for unstructured processing
-            with tempfile.NamedTemporaryFile(
-                suffix=file_extension,
-                delete=False
-            ) as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
+            # Set environment variables for OpenGL fallback
+            import os
+            os.environ.setdefault('LIBGL_ALWAYS_SOFTWARE', '1')
+            os.environ.setdefault('MESA_GL_VERSION_OVERRIDE', '3.3')
+            
+            # Partition straight from memory; no temporary file round trip
+            elements = self._partition_document(file_content, filename)
+            
+            # Check if the parsing extracted meaningful content
+            meaningful_content = False
+            if elements:
+                total_text = ' '.join([getattr(elem, 'text', None) or '' for elem in elements])
+                # Check if we have substantial text content (not just empty or whitespace)
+                meaningful_text = total_text.strip()
+                # Check for meaningful content (not just dots, empty strings, or very short content)
+                # (a single strip finds any character other than dots and whitespace)
+                if len(meaningful_text) > 50 and meaningful_text.strip(' .\n\t'):
+                    meaningful_content = True
+            
+            if not meaningful_content:
+                # If unstructured didn't extract meaningful content, use fallback
+                return self._parse_with_fallback(file_content, filename, file_extension, file_type)
+            
+            # Convert unstructured elements to our DocumentElement format
+            document_elements = self._convert_elements(elements)
+            
+            # Create parsed document
+            parsed_doc = ParsedDocument(
+                filename=filename,
+                file_extension=file_extension,
+                file_type=file_type,
+                total_elements=len(document_elements),
+                grouped_sections=[],  # Will be populated by ContentProcessor
+                parsing_warnings=[]
+            )
+            
+            # Store the elements for processing
+            parsed_doc._raw_elements = document_elements
+            
+            return parsed_doc
             
-            try:
-                # Set environment variables for OpenGL fallback
-                import os
-                os.environ.setdefault('LIBGL_ALWAYS_SOFTWARE', '1')
-                os.environ.setdefault('MESA_GL_VERSION_OVERRIDE', '3.3')
-                
-                elements = self._partition_document(temp_file_path)
-                
-                # Check if the parsing extracted meaningful content
-                meaningful_content = False
-                if elements:
-                    total_text = ' '.join([str(elem) for elem in elements])
-                    # Check if we have substantial text content (not just empty or whitespace)
-                    meaningful_text = total_text.strip()
-                    # Check for meaningful content (not just dots, empty strings, or very short content)
-                    if (len(meaningful_text) > 50 and 
-                        not meaningful_text.replace('.', '').replace(' ', '').replace('\n', '') == '' and
-                        not all(char in ' .\n\t' for char in meaningful_text)):
-                        meaningful_content = True
-                
-                if not meaningful_content:
-                    # If unstructured didn't extract meaningful content, use fallback
-                    return self._parse_with_fallback(file_content, filename, file_extension, file_type)
-                
-                # Convert unstructured elements to our DocumentElement format
-                document_elements = self._convert_elements(elements)
-                
-                # Create parsed document
-                parsed_doc = ParsedDocument(
-                    filename=filename,
-                    file_extension=file_extension,
-                    file_type=file_type,
-                    total_elements=len(document_elements),
-                    grouped_sections=[],  # Will be populated by ContentProcessor
-                    parsing_warnings=[]
-                )
-                
-                # Store the elements for processing
-                parsed_doc._raw_elements = document_elements
-                
-                return parsed_doc
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                    
         except Exception as e:
             error_msg = str(e)
             
@@ -178,11 +218,8 @@ class DocumentParser:
                     except:
                         coordinates = None
                 
-                # Get text content safely
-                try:
-                    text_content = str(element)
-                except:
-                    text_content = ""
+                # Read the text attribute directly rather than going through __str__
+                text_content = getattr(element, 'text', None) or ""
                 
                 # Skip empty elements
                 if not text_content.strip():
@@ -215,21 +252,7 @@ class DocumentParser:
         Returns:
             Corresponding ElementType
         """
-        category_mapping = {
-            'Title': ElementType.TITLE,
-            'NarrativeText': ElementType.NARRATIVE_TEXT,
-            'ListItem': ElementType.LIST_ITEM,
-            'Table': ElementType.TABLE,
-            'Header': ElementType.HEADER,
-            'Footer': ElementType.FOOTER,
-            'EmailAddress': ElementType.EMAIL_ADDRESS,
-            'Address': ElementType.ADDRESS,
-            'PhoneNumber': ElementType.PHONE_NUMBER,
-            'UncategorizedText': ElementType.NARRATIVE_TEXT,  # Fallback
-            'Text': ElementType.NARRATIVE_TEXT,  # Fallback
-        }
-        
-        return category_mapping.get(unstructured_category, ElementType.NARRATIVE_TEXT)
+        return _CATEGORY_MAPPING.get(unstructured_category, ElementType.NARRATIVE_TEXT)
     
     def _get_file_type(self, extension: str) -> str:
         """
@@ -241,16 +264,7 @@ class DocumentParser:
         Returns:
             Human-readable file type
         """
-        type_mapping = {
-            '.pdf': 'PDF Document',
-            '.docx': 'Word Document (DOCX)',
-            '.doc': 'Word Document (DOC)',
-            '.txt': 'Text Document',
-            '.html': 'HTML Document',
-            '.htm': 'HTML Document'
-        }
-        
-        return type_mapping.get(extension, 'Unknown Document Type')
+        return _FILE_TYPE_MAPPING.get(extension, 'Unknown Document Type')
     
     def get_document_stats(self, parsed_doc: ParsedDocument) -> Dict[str, Any]:
         """
@@ -262,30 +276,50 @@ class DocumentParser:
         Returns:
             Dictionary with document statistics
         """
-        element_counts = {}
+        element_counts = Counter()
         total_text_length = 0
         
         for section in parsed_doc.grouped_sections:
             for element in section.elements:
-                element_type = element.element_type.value
-                element_counts[element_type] = element_counts.get(element_type, 0) + 1
+                element_counts[element.element_type.value] += 1
                 total_text_length += len(element.text)
         
         return {
             'total_elements': parsed_doc.total_elements,
-            'element_type_counts': element_counts,
+            'element_type_counts': dict(element_counts),
             'total_text_length': total_text_length,
             'has_warnings': len(parsed_doc.parsing_warnings) > 0,
             'warning_count': len(parsed_doc.parsing_warnings)
         }
-
-    def _partition_document(self, temp_file_path: str):
+    
+    @classmethod
+    def warmup(cls) -> bool:
+        """
+        Load the layout detection model used by hi-res partitioning ahead of time.
+        
+        unstructured keeps loaded models in a process-wide cache, so calling this
+        once at service startup moves the model load out of the first parse.
+        
+        Returns:
+            True if the layout model was loaded, False if it is unavailable
+        """
+        try:
+            from unstructured_inference.models.base import get_model
+            
+            get_model("yolox")
+            return True
+        except Exception:
+            # Layout inference is optional; partitioning falls back without it
+            return False
+    
+    def _partition_document(self, file_content: bytes, filename: str):
         """
         Partition document using unstructured library.
         This method can be overridden for testing purposes.
         
         Args:
-            temp_file_path: Path to temporary file
+            file_content: Raw file content as bytes
+            filename: Original filename, used by unstructured to detect the file type
             
         Returns:
             List of unstructured elements
@@ -293,13 +327,153 @@ class DocumentParser:
         from unstructured.partition.auto import partition
         
         return partition(
-            filename=temp_file_path,
+            file=io.BytesIO(file_content),
+            metadata_filename=filename,
             strategy="auto",
             include_page_breaks=True,
             infer_table_structure=True,
             chunking_strategy=None
         )
-
+    
+    @staticmethod
+    def _iter_nonblank_lines(text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield the stripped non-blank lines of a text with their 1-based line numbers.
+        
+        Scans the text once with a compiled pattern instead of splitting it into
+        a list of every line up front.
+        
+        Args:
+            text: Text to walk
+            
+        Yields:
+            Tuples of (line_number, stripped_line)
+        """
+        line_number = 1
+        position = 0
+        for match in _LINE_RE.finditer(text):
+            # Advance past the newlines (including blank lines) since the previous match
+            line_number += text.count('\n', position, match.start())
+            position = match.start()
+            
+            line = match.group().strip()
+            if line:
+                yield line_number, line
+    
+    @staticmethod
+    def _classify_fallback_line(line: str) -> ElementType:
+        """
+        Classify a single line of text when unstructured is unavailable.
+        
+        Args:
+            line: Stripped, non-empty line of text
+            
+        Returns:
+            Element type inferred from the line content
+        """
+        if _FALLBACK_HEADER_RE.search(line):
+            return ElementType.TITLE
+        if line.startswith(_BULLET_PREFIXES):
+            return ElementType.LIST_ITEM
+        if '@' in line and '.' in line:  # Email address
+            return ElementType.EMAIL_ADDRESS
+        if not _DIGIT_CHARS.isdisjoint(line) and not _PHONE_PUNCTUATION.isdisjoint(line):  # Phone number
+            return ElementType.PHONE_NUMBER
+        return ElementType.NARRATIVE_TEXT
+    
+    def _extract_text_elements(self, file_content: bytes) -> List[DocumentElement]:
+        """
+        Extract line elements from a plain text file.
+        
+        Args:
+            file_content: Raw file content as bytes
+            
+        Returns:
+            List of classified line elements
+        """
+        text_content = file_content.decode('utf-8', errors='ignore')
+        
+        # Walk the non-blank lines and create structured elements
+        elements = []
+        
+        for line_number, line in self._iter_nonblank_lines(text_content):
+            # Determine element type based on content
+            element_type = self._classify_fallback_line(line)
+            
+            elements.append(DocumentElement(
+                element_type=element_type,
+                text=line,
+                metadata={'line_number': line_number},
+                page_number=1
+            ))
+        
+        return elements
+    
+    def _extract_pdf_elements(self, file_content: bytes) -> List[DocumentElement]:
+        """
+        Extract line elements from a PDF using pdfplumber.
+        
+        Args:
+            file_content: Raw file content as bytes
+            
+        Returns:
+            List of classified line elements
+            
+        Raises:
+            ImportError: If pdfplumber is not installed
+        """
+        import pdfplumber
+        
+        elements = []
+        with io.BytesIO(file_content) as pdf_stream:
+            with pdfplumber.open(pdf_stream) as pdf:
+                for page_num, page in enumerate(pdf.pages, 1):
+                    text = page.extract_text()
+                    if text:
+                        # Walk the non-blank lines and create structured elements
+                        for line_number, line in self._iter_nonblank_lines(text):
+                            # Determine element type based on content
+                            element_type = self._classify_fallback_line(line)
+                            
+                            elements.append(DocumentElement(
+                                element_type=element_type,
+                                text=line,
+                                metadata={'page_number': page_num, 'line_number': line_number},
+                                page_number=page_num
+                            ))
+        
+        return elements
+    
+    def _extract_docx_elements(self, file_content: bytes) -> List[DocumentElement]:
+        """
+        Extract paragraph elements from a Word document using python-docx.
+        
+        Args:
+            file_content: Raw file content as bytes
+            
+        Returns:
+            List of paragraph elements
+            
+        Raises:
+            ImportError: If python-docx is not installed
+        """
+        from docx import Document
+        
+        elements = []
+        with io.BytesIO(file_content) as docx_stream:
+            doc = Document(docx_stream)
+            
+            for paragraph in doc.paragraphs:
+                if paragraph.text.strip():
+                    elements.append(DocumentElement(
+                        element_type=ElementType.NARRATIVE_TEXT,
+                        text=paragraph.text,
+                        metadata={},
+                        page_number=1
+                    ))
+        
+        return elements
+    
     def _parse_with_fallback(self, file_content: bytes, filename: str, file_extension: str, file_type: str) -> ParsedDocument:
         """
         Fallback parsing method when OpenGL libraries are not available.
@@ -315,131 +489,13 @@ class DocumentParser:
             ParsedDocument with extracted elements
         """
         try:
-            # For text files, use simple text extraction
-            if file_extension in ['.txt']:
-                text_content = file_content.decode('utf-8', errors='ignore')
-                
-                # Split text into lines and create structured elements
-                lines = text_content.split('\n')
-                elements = []
-                
-                for i, line in enumerate(lines):
-                    line = line.strip()
-                    if line:
-                        # Determine element type based on content
-                        if any(keyword in line.lower() for keyword in ['summary', 'objective', 'profile', 'about']):
-                            element_type = ElementType.TITLE
-                        elif any(keyword in line.lower() for keyword in ['experience', 'work', 'employment', 'career']):
-                            element_type = ElementType.TITLE
-                        elif any(keyword in line.lower() for keyword in ['education', 'academic', 'degree', 'university']):
-                            element_type = ElementType.TITLE
-                        elif any(keyword in line.lower() for keyword in ['skills', 'competencies', 'expertise', 'technologies']):
-                            element_type = ElementType.TITLE
-                        elif any(keyword in line.lower() for keyword in ['certifications', 'certificates', 'licenses']):
-                            element_type = ElementType.TITLE
-                        elif line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                            element_type = ElementType.LIST_ITEM
-                        elif '@' in line and '.' in line:  # Email address
-                            element_type = ElementType.EMAIL_ADDRESS
-                        elif any(char.isdigit() for char in line) and any(char in '()-' for char in line):  # Phone number
-                            element_type = ElementType.PHONE_NUMBER
-                        else:
-                            element_type = ElementType.NARRATIVE_TEXT
-                        
-                        elements.append(DocumentElement(
-                            element_type=element_type,
-                            text=line,
-                            metadata={'line_number': i + 1},
-                            page_number=1
-                        ))
-                
-                parsed_doc = ParsedDocument(
-                    filename=filename,
-                    file_extension=file_extension,
-                    file_type=file_type,
-                    total_elements=len(elements),
-                    grouped_sections=[],
-                    parsing_warnings=["Document parsed successfully using text extraction"]
-                )
-                parsed_doc._raw_elements = elements
-                return parsed_doc
-            
-            # For PDF files, try using pdfplumber as fallback
-            elif file_extension == '.pdf':
-                try:
-                    import pdfplumber
-                    import io
-                    
-                    with io.BytesIO(file_content) as pdf_stream:
-                        with pdfplumber.open(pdf_stream) as pdf:
-                            elements = []
-                            for page_num, page in enumerate(pdf.pages, 1):
-                                text = page.extract_text()
-                                if text:
-                                    # Split text into lines and create structured elements
-                                    lines = text.split('\n')
-                                    for i, line in enumerate(lines):
-                                        line = line.strip()
-                                        if line:
-                                            # Determine element type based on content
-                                            if any(keyword in line.lower() for keyword in ['summary', 'objective', 'profile', 'about']):
-                                                element_type = ElementType.TITLE
-                                            elif any(keyword in line.lower() for keyword in ['experience', 'work', 'employment', 'career']):
-                                                element_type = ElementType.TITLE
-                                            elif any(keyword in line.lower() for keyword in ['education', 'academic', 'degree', 'university']):
-                                                element_type = ElementType.TITLE
-                                            elif any(keyword in line.lower() for keyword in ['skills', 'competencies', 'expertise', 'technologies']):
-                                                element_type = ElementType.TITLE
-                                            elif any(keyword in line.lower() for keyword in ['certifications', 'certificates', 'licenses']):
-                                                element_type = ElementType.TITLE
-                                            elif line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                                                element_type = ElementType.LIST_ITEM
-                                            elif '@' in line and '.' in line:  # Email address
-                                                element_type = ElementType.EMAIL_ADDRESS
-                                            elif any(char.isdigit() for char in line) and any(char in '()-' for char in line):  # Phone number
-                                                element_type = ElementType.PHONE_NUMBER
-                                            else:
-                                                element_type = ElementType.NARRATIVE_TEXT
-                                            
-                                            elements.append(DocumentElement(
-                                                element_type=element_type,
-                                                text=line,
-                                                metadata={'page_number': page_num, 'line_number': i + 1},
-                                                page_number=page_num
-                                            ))
-                    
-                    parsed_doc = ParsedDocument(
-                        filename=filename,
-                        file_extension=file_extension,
-                        file_type=file_type,
-                        total_elements=len(elements),
-                        grouped_sections=[],
-                        parsing_warnings=["Document parsed successfully using PDF text extraction"]
-                    )
-                    parsed_doc._raw_elements = elements
-                    return parsed_doc
-                except ImportError:
-                    # If pdfplumber is not available, try basic text extraction
-                    pass
-            
-            # For DOCX files, try using python-docx as fallback
-            elif file_extension == '.docx':
+            # Format-specific extraction; if its optional library is not
+            # available, fall through to basic text extraction
+            fallback_extractor = self._fallback_extractors.get(file_extension)
+            if fallback_extractor:
+                extract_elements, success_message = fallback_extractor
                 try:
-                    from docx import Document
-                    import io
-                    
-                    with io.BytesIO(file_content) as docx_stream:
-                        doc = Document(docx_stream)
-                        elements = []
-                        
-                        for paragraph in doc.paragraphs:
-                            if paragraph.text.strip():
-                                elements.append(DocumentElement(
-                                    element_type=ElementType.NARRATIVE_TEXT,
-                                    text=paragraph.text,
-                                    metadata={},
-                                    page_number=1
-                                ))
+                    elements = extract_elements(file_content)
                     
                     parsed_doc = ParsedDocument(
                         filename=filename,
@@ -447,26 +503,24 @@ class DocumentParser:
                         file_type=file_type,
                         total_elements=len(elements),
                         grouped_sections=[],
-                        parsing_warnings=["Document parsed successfully using Word document extraction"]
+                        parsing_warnings=[success_message]
                     )
                     parsed_doc._raw_elements = elements
                     return parsed_doc
                 except ImportError:
-                    # If python-docx is not available, try basic text extraction
                     pass
             
             # Ultimate fallback: try to extract any readable text
             try:
-                text_content = file_content.decode('utf-8', errors='ignore')
+                # Detect the encoding in one pass and decode once
+                best_match = from_bytes(file_content).best()
+                text_content = str(best_match) if best_match else ''
+                
+                if not text_content.strip():
+                    text_content = file_content.decode('utf-8', errors='ignore')
                 if not text_content.strip():
-                    # Try other encodings
-                    for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                        try:
-                            text_content = file_content.decode(encoding, errors='ignore')
-                            if text_content.strip():
-                                break
-                        except:
-                            continue
+                    # latin-1 maps every byte, so no other single-byte codec can do better
+                    text_content = file_content.decode('latin-1')
                 
                 if text_content.strip():
                     elements = [DocumentElement(
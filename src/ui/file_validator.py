@@ -4,153 +4,197 @@ Handles file type checking, size validation, and content verification.
 """
 
 import os
+import re
+import codecs
 import mimetypes
 from typing import Tuple, Optional, List
 from io import BytesIO
 
 from config.settings import settings, validate_file_extension, validate_file_size, get_file_type_from_extension
 
+# Leading magic bytes for binary formats, one named group per format
+_MAGIC_RE = re.compile(
+    rb'(?P<pdf>%PDF-)'
+    rb'|(?P<docx>PK)'  # DOCX is a ZIP archive
+    rb'|(?P<doc>\xd0\xcf\x11\xe0|\x0d\x44\x4f\x43)'
+)
+
+# Magic group expected for each binary extension, with the error reported when it is missing
+_MAGIC_SIGNATURES = {
+    ".pdf": ("pdf", "Invalid PDF file format"),
+    ".docx": ("docx", "Invalid DOCX file format"),
+    ".doc": ("doc", "Invalid DOC file format"),
+}
+
+# Text files are validated from their first bytes only, however large the upload
+_DECODE_PROBE_BYTES = 8192
+
+# Opening tags that mark a file as HTML; matched case-insensitively on the raw bytes
+_HTML_TAG_RE = re.compile(rb'<(?:html|body|div|p)', re.IGNORECASE)
+
+# Supported extensions as listed in validation errors, built once at import
+_SUPPORTED_EXTENSIONS_TEXT = ", ".join(sorted(settings.SUPPORTED_EXTENSIONS))
+
 
 class FileValidationError(Exception):
     """Custom exception for file validation errors."""
     pass
 
 
-class FileValidator:
-    """Handles validation of uploaded resume files."""
+def _decode_probe(file_content: bytes, encoding: str) -> str:
+    """
+    Decode only the start of the file to check its encoding.
     
-    @staticmethod
-    def validate_uploaded_file(
-        file_content: bytes,
-        filename: str,
-        mime_type: Optional[str] = None
-    ) -> Tuple[bool, List[str]]:
-        """
-        Validate an uploaded file for resume parsing.
-        
-        Args:
-            file_content: Raw file content as bytes
-            filename: Original filename
-            mime_type: MIME type if available
-            
-        Returns:
-            Tuple of (is_valid, list_of_errors)
-        """
-        errors = []
-        
-        # Check filename
-        if not filename or not filename.strip():
-            errors.append("Filename is required")
-            return False, errors
-        
-        # Check file extension
-        if not validate_file_extension(filename):
-            supported_exts = ", ".join(sorted(settings.SUPPORTED_EXTENSIONS))
-            errors.append(f"Unsupported file type. Supported formats: {supported_exts}")
-        
-        # Check file size
-        file_size = len(file_content)
-        if not validate_file_size(file_size):
-            max_mb = settings.MAX_FILE_SIZE_MB
-            actual_mb = round(file_size / (1024 * 1024), 2)
-            errors.append(f"File too large ({actual_mb}MB). Maximum size: {max_mb}MB")
-        
-        # Check if file is empty
-        if file_size == 0:
-            errors.append("File is empty")
-        
-        # Validate MIME type if provided
-        if mime_type and mime_type not in settings.SUPPORTED_MIME_TYPES:
-            # Try to guess MIME type from filename
-            guessed_type, _ = mimetypes.guess_type(filename)
-            if guessed_type not in settings.SUPPORTED_MIME_TYPES:
-                errors.append(f"Unsupported MIME type: {mime_type}")
+    An incremental decoder is used so a multi-byte character cut off at the
+    probe boundary is not mistaken for invalid content.
+    
+    Args:
+        file_content: Raw file content
+        encoding: Text encoding to try
         
-        # Basic content validation
-        try:
-            content_errors = FileValidator._validate_file_content(file_content, filename)
-            errors.extend(content_errors)
-        except Exception as e:
-            errors.append(f"Content validation error: {str(e)}")
+    Returns:
+        Decoded text of the probed bytes
         
-        return len(errors) == 0, errors
+    Raises:
+        UnicodeDecodeError: If the probed bytes are not valid in the encoding
+    """
+    probe = file_content[:_DECODE_PROBE_BYTES]
+    decoder = codecs.getincrementaldecoder(encoding)()
+    return decoder.decode(probe, final=len(file_content) <= _DECODE_PROBE_BYTES)
+
+
+def _validate_file_content(file_content: bytes, filename: str) -> List[str]:
+    """
+    Perform basic content validation based on file type.
     
-    @staticmethod
-    def _validate_file_content(file_content: bytes, filename: str) -> List[str]:
-        """
-        Perform basic content validation based on file type.
+    Args:
+        file_content: Raw file content
+        filename: Original filename
         
-        Args:
-            file_content: Raw file content
-            filename: Original filename
-            
-        Returns:
-            List of validation errors
-        """
-        errors = []
-        ext = os.path.splitext(filename.lower())[1]
+    Returns:
+        List of validation errors
+    """
+    errors = []
+    ext = os.path.splitext(filename.lower())[1]
+    
+    try:
+        signature = _MAGIC_SIGNATURES.get(ext)
+        if signature:
+            # Binary formats are recognised by their leading magic bytes
+            expected_format, error_message = signature
+            magic_match = _MAGIC_RE.match(file_content)
+            if not magic_match or magic_match.lastgroup != expected_format:
+                errors.append(error_message)
         
-        try:
-            if ext == ".pdf":
-                # Check for PDF header
-                if not file_content.startswith(b'%PDF-'):
-                    errors.append("Invalid PDF file format")
-            
-            elif ext in [".docx"]:
-                # Check for ZIP header (DOCX is a ZIP archive)
-                if not file_content.startswith(b'PK'):
-                    errors.append("Invalid DOCX file format")
-            
-            elif ext == ".doc":
-                # Check for DOC header
-                if not (file_content.startswith(b'\xd0\xcf\x11\xe0') or 
-                       file_content.startswith(b'\x0d\x44\x4f\x43')):
-                    errors.append("Invalid DOC file format")
-            
-            elif ext in [".txt"]:
-                # Try to decode as text
+        elif ext in [".txt"]:
+            # Try to decode as text
+            try:
+                _decode_probe(file_content, 'utf-8')
+            except UnicodeDecodeError:
                 try:
-                    file_content.decode('utf-8')
+                    _decode_probe(file_content, 'latin-1')
                 except UnicodeDecodeError:
-                    try:
-                        file_content.decode('latin-1')
-                    except UnicodeDecodeError:
-                        errors.append("Text file contains invalid characters")
-            
-            elif ext in [".html", ".htm"]:
-                # Basic HTML validation
-                try:
-                    content_str = file_content.decode('utf-8')
-                    if not any(tag in content_str.lower() for tag in ['<html', '<body', '<div', '<p']):
-                        errors.append("File does not appear to contain valid HTML")
-                except UnicodeDecodeError:
-                    errors.append("HTML file contains invalid characters")
-        
-        except Exception as e:
-            errors.append(f"Content validation failed: {str(e)}")
+                    errors.append("Text file contains invalid characters")
         
-        return errors
+        elif ext in [".html", ".htm"]:
+            # Basic HTML validation
+            try:
+                _decode_probe(file_content, 'utf-8')
+                # The tag check needs no decoded text; search the probed bytes in place
+                if not _HTML_TAG_RE.search(file_content, 0, _DECODE_PROBE_BYTES):
+                    errors.append("File does not appear to contain valid HTML")
+            except UnicodeDecodeError:
+                errors.append("HTML file contains invalid characters")
     
-    @staticmethod
-    def get_file_info(filename: str, file_size: int) -> dict:
-        """
-        Get file information for display purposes.
+    except Exception as e:
+        errors.append(f"Content validation failed: {str(e)}")
+    
+    return errors
+
+
+def validate_uploaded_file(
+    file_content: bytes,
+    filename: str,
+    mime_type: Optional[str] = None
+) -> Tuple[bool, List[str]]:
+    """
+    Validate an uploaded file for resume parsing.
+    
+    Args:
+        file_content: Raw file content as bytes
+        filename: Original filename
+        mime_type: MIME type if available
         
-        Args:
-            filename: Original filename
-            file_size: File size in bytes
-            
-        Returns:
-            Dictionary with file information
-        """
-        ext = os.path.splitext(filename.lower())[1]
+    Returns:
+        Tuple of (is_valid, list_of_errors)
+    """
+    errors = []
+    
+    # Check filename
+    if not filename or not filename.strip():
+        errors.append("Filename is required")
+        return False, errors
+    
+    # Check file extension
+    if not validate_file_extension(filename):
+        errors.append(f"Unsupported file type. Supported formats: {_SUPPORTED_EXTENSIONS_TEXT}")
+    
+    # Check file size
+    file_size = len(file_content)
+    if not validate_file_size(file_size):
+        max_mb = settings.MAX_FILE_SIZE_MB
+        actual_mb = round(file_size / (1024 * 1024), 2)
+        errors.append(f"File too large ({actual_mb}MB). Maximum size: {max_mb}MB")
+    
+    # Check if file is empty
+    if file_size == 0:
+        errors.append("File is empty")
+    
+    # Validate MIME type if provided
+    if mime_type and mime_type not in settings.SUPPORTED_MIME_TYPES:
+        # Try to guess MIME type from filename
+        guessed_type, _ = mimetypes.guess_type(filename)
+        if guessed_type not in settings.SUPPORTED_MIME_TYPES:
+            errors.append(f"Unsupported MIME type: {mime_type}")
+    
+    # Basic content validation
+    try:
+        content_errors = _validate_file_content(file_content, filename)
+        errors.extend(content_errors)
+    except Exception as e:
+        errors.append(f"Content validation error: {str(e)}")
+    
+    return len(errors) == 0, errors
+
+
+def get_file_info(filename: str, file_size: int) -> dict:
+    """
+    Get file information for display purposes.
+    
+    Args:
+        filename: Original filename
+        file_size: File size in bytes
         
-        return {
-            "filename": filename,
-            "extension": ext,
-            "file_type": get_file_type_from_extension(filename),
-            "size_bytes": file_size,
-            "size_mb": round(file_size / (1024 * 1024), 2),
-            "is_supported": validate_file_extension(filename),
-            "is_valid_size": validate_file_size(file_size)
-        }
+    Returns:
+        Dictionary with file information
+    """
+    ext = os.path.splitext(filename.lower())[1]
+    
+    return {
+        "filename": filename,
+        "extension": ext,
+        "file_type": get_file_type_from_extension(filename),
+        "size_bytes": file_size,
+        "size_mb": round(file_size / (1024 * 1024), 2),
+        "is_supported": validate_file_extension(filename),
+        "is_valid_size": validate_file_size(file_size)
+    }
+
+
+class FileValidator:
+    """Handles validation of uploaded resume files."""
+    
+    # The validators are plain module functions; these aliases keep the
+    # public FileValidator API working for existing callers
+    validate_uploaded_file = staticmethod(validate_uploaded_file)
+    get_file_info = staticmethod(get_file_info)
@@ -4,18 +4,237 @@ Provides file upload interface and displays parsed results.
 """
 
 import streamlit as st
-import json
-from typing import Optional, Dict, Any, List
+import pandas as pd
+import orjson
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Optional, Dict, Any, List, Tuple
 from io import BytesIO
 import traceback
 
 from config.settings import settings
 from src.ui.file_validator import FileValidator, FileValidationError
+from pydantic import ValidationError
+
 from src.models.schema import ResumeSchema
 from src.parsers.document_parser import DocumentParser
 from src.parsers.content_processor import ContentProcessor
 from src.models.resume_elements import ParsedDocument
-from src.agents.gpt_extractor import GPTExtractor
+from src.models.token_usage import TokenTracker
+from src.agents.gpt_extractor import GPTExtractor, PROMPT_VERSION
+
+# Longest a parse waits (in seconds) for the background model warmup before it
+# goes ahead on its own; most uploads never need the layout model at all
+_WARMUP_WAIT_SECONDS = 5
+
+
+@st.cache_resource
+def get_document_parser() -> DocumentParser:
+    """Create the document parser once per server process and share it across reruns."""
+    return DocumentParser()
+
+
+@st.cache_resource
+def start_model_warmup() -> threading.Thread:
+    """
+    Load unstructured's layout model in the background once per server process.
+    
+    Started before the first page render. parse_document_cached gives the
+    thread up to _WARMUP_WAIT_SECONDS to finish and then parses regardless, so
+    a slow or stalled model download never holds up an upload.
+    """
+    thread = threading.Thread(target=DocumentParser.warmup, name="unstructured-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+@st.cache_resource
+def get_content_processor() -> ContentProcessor:
+    """Create the content processor once per server process and share it across reruns."""
+    return ContentProcessor()
+
+
+class _UncachedParse(Exception):
+    """Carries a failed parse out of parse_document_cached so Streamlit does not cache it."""
+    
+    def __init__(self, parsed_doc: ParsedDocument):
+        super().__init__("Document parsing failed")
+        self.parsed_doc = parsed_doc
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def parse_document_cached(
+    file_hash: str,
+    filename: str,
+    mime_type: Optional[str],
+    _file_content: bytes
+) -> ParsedDocument:
+    """
+    Parse a document, reusing the result for identical uploads.
+    
+    Parsing is deterministic in the file bytes, name and MIME type. The bytes
+    are keyed by their SHA-256 (the underscore keeps Streamlit from hashing the
+    payload again), and each call gets its own copy of the cached document.
+    
+    parse_document reports failures as an empty document with a "Parsing
+    failed" warning instead of raising. Those results are raised as
+    _UncachedParse, since Streamlit never caches a call that raises, so a
+    transient failure is retried on the next upload.
+    
+    Args:
+        file_hash: SHA-256 of the file content
+        filename: Original filename
+        mime_type: MIME type of the file
+        _file_content: Raw file content as bytes
+        
+    Returns:
+        ParsedDocument with extracted elements
+        
+    Raises:
+        _UncachedParse: If parsing produced no elements or failed
+    """
+    start_model_warmup().join(timeout=_WARMUP_WAIT_SECONDS)
+    parsed_doc = get_document_parser().parse_document(
+        file_content=_file_content,
+        filename=filename,
+        mime_type=mime_type
+    )
+    if parsed_doc.total_elements == 0 or any(
+        warning.startswith("Parsing failed") for warning in parsed_doc.parsing_warnings
+    ):
+        raise _UncachedParse(parsed_doc)
+    return parsed_doc
+
+
+@st.cache_resource
+def get_gpt_extractor() -> GPTExtractor:
+    """
+    Create the GPT extractor once per server process and share it across reruns.
+    
+    Keeps the OpenAI client's connection pool, the tokenizer and the prebuilt
+    prompts alive between interactions. Initialization errors are not cached,
+    so a fixed API key is picked up on the next attempt.
+    """
+    return GPTExtractor()
+
+
+def get_session_token_tracker() -> TokenTracker:
+    """
+    Get the token tracker for the current browser session.
+    
+    Kept in st.session_state rather than on the shared GPT extractor, so each
+    user only sees the usage of their own extractions.
+    """
+    if 'token_tracker' not in st.session_state:
+        st.session_state['token_tracker'] = TokenTracker()
+    return st.session_state['token_tracker']
+
+
+class _ExtractionMemoryCache:
+    """
+    Bounded in-memory extraction cache with least-recently-used eviction.
+    
+    Mirrors the get/set interface of diskcache.Cache so either can back
+    get_extraction_cache().
+    """
+    
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Any:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Any, value: Any, expire: Optional[float] = None) -> None:
+        """Store value under key, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + expire if expire else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_extraction_cache():
+    """
+    Create the extraction cache once per server process.
+    
+    Extractions are kept in a bounded in-memory cache by default. Setting
+    EXTRACTION_CACHE_DIR opts into a size-limited diskcache store that survives
+    restarts; it holds resume contents, so point it at private storage only.
+    """
+    if settings.EXTRACTION_CACHE_DIR:
+        import diskcache
+        return diskcache.Cache(
+            settings.EXTRACTION_CACHE_DIR,
+            size_limit=settings.EXTRACTION_CACHE_SIZE_LIMIT_MB * 1024 * 1024
+        )
+    return _ExtractionMemoryCache(settings.EXTRACTION_CACHE_MAX_ENTRIES)
+
+
+def dump_resume_json(resume_dict: Dict[str, Any]) -> str:
+    """
+    Serialize a resume dictionary to indented JSON with orjson.
+    
+    Args:
+        resume_dict: Resume data as returned by ResumeSchema.dict()
+        
+    Returns:
+        JSON string indented by two spaces, with non-ASCII characters kept as is
+    """
+    return orjson.dumps(resume_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def group_skills(
+    skills: Tuple[Tuple[str, Optional[str], bool, Optional[str]], ...]
+) -> Tuple[Dict[str, str], int, int]:
+    """
+    Group skills by category and build their color-coded tags.
+    
+    Args:
+        skills: Tuple of (name, category, isInferred, inferredFrom) per skill
+        
+    Returns:
+        Tuple of (category -> joined skill tags, explicit count, inferred count)
+    """
+    skills_by_category = defaultdict(lambda: {"explicit": [], "inferred": []})
+    
+    for name, category, is_inferred, inferred_from in skills:
+        skill_groups = skills_by_category[category or "General"]
+        if not is_inferred:
+            # Explicit skills (green)
+            skill_groups["explicit"].append(f":green[{name}]")
+        elif inferred_from:
+            # Inferred skills (blue) with inference info
+            skill_groups["inferred"].append(f":blue[{name}] *(inferred from: {inferred_from})*")
+        else:
+            skill_groups["inferred"].append(f":blue[{name}] *(inferred)*")
+    
+    explicit_count = sum(len(groups["explicit"]) for groups in skills_by_category.values())
+    inferred_count = len(skills) - explicit_count
+    
+    # Explicit tags are listed before inferred ones within each category
+    category_tags = {
+        category: " • ".join(groups["explicit"] + groups["inferred"])
+        for category, groups in skills_by_category.items()
+    }
+    
+    return category_tags, explicit_count, inferred_count
 
 
 class ResumeParserUI:
@@ -24,8 +243,9 @@ class ResumeParserUI:
     def __init__(self):
         """Initialize the UI with configuration."""
         self.validator = FileValidator()
-        self.document_parser = DocumentParser()
-        self.content_processor = ContentProcessor()
+        # Parsers hold no per-document state, so one instance serves every session
+        self.document_parser = get_document_parser()
+        self.content_processor = get_content_processor()
         self.gpt_extractor = None  # Initialize lazily to handle API key issues
         self._setup_page_config()
     
@@ -82,21 +302,26 @@ class ResumeParserUI:
         )
         
         if uploaded_file is not None:
-            # Get file content
-            file_content = uploaded_file.read()
+            # Reruns (tab clicks, button presses) hand back the same upload; once it
+            # has passed validation, reuse its file data instead of re-hashing and
+            # re-validating it
+            validated_upload = st.session_state.get('validated_upload')
+            if validated_upload and validated_upload[0] == uploaded_file.file_id:
+                file_data = validated_upload[1]
+                self._render_file_info(file_data["filename"], file_data["file_info"])
+                st.success("✅ File validation passed!")
+                return file_data
+            
+            # The upload is already held in memory; getvalue() shares that buffer
+            # instead of copying it, and the hash streams over it in chunks
+            file_content = uploaded_file.getvalue()
             filename = uploaded_file.name
-            file_size = len(file_content)
+            file_size = uploaded_file.size
+            file_hash = hashlib.file_digest(uploaded_file, "sha256").hexdigest()
             
             # Display file info
             file_info = self.validator.get_file_info(filename, file_size)
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("File Name", filename)
-            with col2:
-                st.metric("File Type", file_info["file_type"])
-            with col3:
-                st.metric("File Size", f"{file_info['size_mb']} MB")
+            self._render_file_info(filename, file_info)
             
             # Validate file
             is_valid, errors = self.validator.validate_uploaded_file(
@@ -111,15 +336,35 @@ class ResumeParserUI:
             
             st.success("✅ File validation passed!")
             
-            return {
+            file_data = {
                 "content": file_content,
                 "filename": filename,
                 "file_info": file_info,
-                "mime_type": uploaded_file.type
+                "mime_type": uploaded_file.type,
+                "sha256": file_hash
             }
+            st.session_state['validated_upload'] = (uploaded_file.file_id, file_data)
+            
+            return file_data
         
         return None
     
+    def _render_file_info(self, filename: str, file_info: Dict[str, Any]) -> None:
+        """
+        Render name, type and size of the uploaded file.
+        
+        Args:
+            filename: Original filename
+            file_info: File information from the validator
+        """
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("File Name", filename)
+        with col2:
+            st.metric("File Type", file_info["file_type"])
+        with col3:
+            st.metric("File Size", f"{file_info['size_mb']} MB")
+    
     def process_document(self, file_data: Dict[str, Any]) -> Optional[ParsedDocument]:
         """
         Process uploaded document using unstructured library.
@@ -139,11 +384,15 @@ class ResumeParserUI:
                 status_text.text("📄 Extracting document elements...")
                 progress_bar.progress(0.25)
                 
-                parsed_doc = self.document_parser.parse_document(
-                    file_content=file_data["content"],
-                    filename=file_data["filename"],
-                    mime_type=file_data.get("mime_type")
-                )
+                try:
+                    parsed_doc = parse_document_cached(
+                        file_data["sha256"],
+                        file_data["filename"],
+                        file_data.get("mime_type"),
+                        file_data["content"]
+                    )
+                except _UncachedParse as failed:
+                    parsed_doc = failed.parsed_doc
                 
                 if parsed_doc.parsing_warnings:
                     for warning in parsed_doc.parsing_warnings:
@@ -180,7 +429,7 @@ class ResumeParserUI:
             return True
         
         try:
-            self.gpt_extractor = GPTExtractor()
+            self.gpt_extractor = get_gpt_extractor()
             return True
         except ValueError as e:
             st.error(f"❌ OpenAI API configuration error: {str(e)}")
@@ -190,16 +439,44 @@ class ResumeParserUI:
             st.error(f"❌ Failed to initialize GPT extractor: {str(e)}")
             return False
     
-    def extract_structured_data(self, parsed_doc: ParsedDocument) -> Optional[ResumeSchema]:
+    def _get_cached_extraction(self, cache_key: tuple) -> Optional[ResumeSchema]:
+        """
+        Look up a previous extraction of the same file, model and prompt version.
+        
+        Args:
+            cache_key: Tuple of (file sha256, model name, prompt version)
+            
+        Returns:
+            Cached ResumeSchema, or None on a miss or if it no longer validates
+        """
+        cached = get_extraction_cache().get(cache_key)
+        if cached is None:
+            return None
+        
+        # Entries written by an older schema are re-extracted instead of failing
+        try:
+            return ResumeSchema.parse_obj(cached)
+        except ValidationError:
+            return None
+    
+    def extract_structured_data(self, parsed_doc: ParsedDocument, file_hash: Optional[str] = None) -> Optional[ResumeSchema]:
         """
         Extract structured resume data using GPT-4o.
         
         Args:
             parsed_doc: Parsed document with grouped sections
+            file_hash: SHA-256 of the uploaded file, used to reuse earlier extractions
             
         Returns:
             ResumeSchema with structured data or None if extraction fails
         """
+        cache_key = (file_hash, settings.OPENAI_MODEL, PROMPT_VERSION) if file_hash else None
+        if cache_key:
+            cached_resume = self._get_cached_extraction(cache_key)
+            if cached_resume:
+                st.info("♻️ Loaded previous extraction of this file")
+                return cached_resume
+        
         try:
             with st.spinner("🤖 Extracting structured data with GPT-4o..."):
                 progress_bar = st.progress(0)
@@ -214,14 +491,35 @@ class ResumeParserUI:
                 
                 # Extract structured data
                 status_text.text("🧠 Analyzing resume content with GPT-4o...")
-                progress_bar.progress(0.5)
+                progress_bar.progress(0.2)
                 
-                structured_data = self.gpt_extractor.extract_structured_data(parsed_doc)
+                # Streamed tokens move the bar between sub-task completions; the
+                # estimate is capped so the bar never outruns the finished parts
+                def update_progress(completed: int, total: int, streamed_tokens: int) -> None:
+                    streamed_fraction = min(streamed_tokens / (total * settings.OPENAI_MAX_TOKENS), 0.99)
+                    status_text.text(
+                        f"🧠 Extracted {completed}/{total} resume parts with GPT-4o "
+                        f"({streamed_tokens:,} tokens received)..."
+                    )
+                    progress_bar.progress(0.2 + 0.7 * max(completed / total, streamed_fraction))
+                
+                structured_data, token_usage = self.gpt_extractor.extract_structured_data(
+                    parsed_doc, progress_callback=update_progress
+                )
+                if token_usage:
+                    get_session_token_tracker().add_usage(token_usage)
                 
                 if structured_data:
                     status_text.text("✅ Structured data extraction complete!")
                     progress_bar.progress(1.0)
                     
+                    if cache_key:
+                        get_extraction_cache().set(
+                            cache_key,
+                            structured_data.dict(),
+                            expire=settings.EXTRACTION_CACHE_TTL_SECONDS
+                        )
+                    
                     # Show extraction statistics
                     stats = self.gpt_extractor.get_extraction_stats(structured_data)
                     
@@ -254,96 +552,44 @@ class ResumeParserUI:
         """
         Render comprehensive token usage and cost statistics.
         """
-        if not self.gpt_extractor:
-            return
+        token_tracker = get_session_token_tracker()
         
-        # Get current session token usage
-        current_usage = self.gpt_extractor.get_token_usage()
-        total_usage = self.gpt_extractor.get_total_token_usage()
+        # Get this session's latest and cumulative token usage
+        current_usage = token_tracker.get_current_usage()
+        total_usage = token_tracker.get_total_usage()
         
         if current_usage:
             st.subheader("💰 GPT-4o Token Usage & Cost Analysis")
             
-            # Current session stats
-            st.markdown("**Current Extraction:**")
-            col1, col2, col3, col4 = st.columns(4)
+            # One table for the latest extraction, with this browser session's
+            # totals alongside once it has run more than one extraction
+            usage_columns = [("", current_usage)]
+            if len(token_tracker.usage_history) > 1:
+                usage_columns.append(("Your Session ", total_usage))
             
-            with col1:
-                st.metric(
-                    "Input Tokens", 
-                    f"{current_usage.input_tokens:,}",
-                    help="Tokens sent to GPT-4o (prompts + resume content)"
-                )
-                st.caption(f"Cost: {current_usage.format_cost(current_usage.input_cost)}")
+            rows = []
+            for category, tokens_field, cost_field in (
+                ("Input", "input_tokens", "input_cost"),
+                ("Cached Input", "cached_input_tokens", "cached_input_cost"),
+                ("Output", "output_tokens", "output_cost"),
+                ("Total", "total_tokens", "total_cost"),
+            ):
+                row = {"Category": category}
+                for prefix, usage in usage_columns:
+                    row[f"{prefix}Tokens"] = getattr(usage, tokens_field)
+                    row[f"{prefix}Cost"] = getattr(usage, cost_field)
+                rows.append(row)
             
-            with col2:
-                if current_usage.cached_input_tokens > 0:
-                    st.metric(
-                        "Cached Tokens", 
-                        f"{current_usage.cached_input_tokens:,}",
-                        help="Cached input tokens (50% cost savings)"
-                    )
-                    st.caption(f"Cost: {current_usage.format_cost(current_usage.cached_input_cost)}")
-                else:
-                    st.metric("Cached Tokens", "0", help="No cached tokens used")
-                    st.caption("Cost: $0.000000")
-            
-            with col3:
-                st.metric(
-                    "Output Tokens", 
-                    f"{current_usage.output_tokens:,}",
-                    help="Tokens generated by GPT-4o (structured JSON response)"
-                )
-                st.caption(f"Cost: {current_usage.format_cost(current_usage.output_cost)}")
-            
-            with col4:
-                st.metric(
-                    "Total Cost", 
-                    current_usage.format_cost(current_usage.total_cost),
-                    help="Total cost for this extraction"
-                )
-                st.caption(f"Total: {current_usage.total_tokens:,} tokens")
-            
-            # Cost breakdown details
-            with st.expander("📊 Detailed Cost Breakdown", expanded=False):
-                breakdown = current_usage.get_cost_breakdown()
-                
-                st.markdown("**Token Distribution:**")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.json({
-                        "Input Tokens": breakdown["input_tokens"],
-                        "Cached Input Tokens": breakdown["cached_input_tokens"],
-                        "Output Tokens": breakdown["output_tokens"],
-                        "Total Tokens": breakdown["total_tokens"]
-                    })
-                
-                with col2:
-                    st.markdown("**Cost Analysis:**")
-                    st.markdown(f"• Input Cost: {breakdown['input_cost']}")
-                    if breakdown["cached_input_tokens"] > 0:
-                        st.markdown(f"• Cached Input Cost: {breakdown['cached_input_cost']} (50% savings)")
-                    st.markdown(f"• Output Cost: {breakdown['output_cost']}")
-                    st.markdown(f"• **Total Cost: {breakdown['total_cost']}**")
-                
-                st.markdown("**Pricing Reference (per 1M tokens):**")
-                st.markdown("• Input: $2.50 | Cached Input: $1.25 | Output: $10.00")
-            
-            # Session totals if multiple extractions
-            if len(self.gpt_extractor.token_tracker.usage_history) > 1:
-                st.markdown("---")
-                st.markdown("**Session Totals:**")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total Input", f"{total_usage.input_tokens:,}")
-                with col2:
-                    st.metric("Total Cached", f"{total_usage.cached_input_tokens:,}")
-                with col3:
-                    st.metric("Total Output", f"{total_usage.output_tokens:,}")
-                with col4:
-                    st.metric("Session Cost", total_usage.format_cost(total_usage.total_cost))
+            usage_df = pd.DataFrame(rows)
+            st.dataframe(
+                usage_df.style.format({
+                    column: "${:.6f}" if column.endswith("Cost") else "{:,}"
+                    for column in usage_df.columns if column != "Category"
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+            st.caption("Pricing per 1M tokens: Input $2.50 | Cached Input $1.25 (50% savings) | Output $10.00")
     
     def _render_skills_with_inference(self, skills: List) -> None:
         """
@@ -361,22 +607,11 @@ class ResumeParserUI:
             - 🔵 Inferred by GPT-4o
             """)
         
-        # Group skills by category
-        skills_by_category = {}
-        inferred_count = 0
-        explicit_count = 0
-        
-        for skill in skills:
-            category = skill.category or "General"
-            if category not in skills_by_category:
-                skills_by_category[category] = {"explicit": [], "inferred": []}
-            
-            if getattr(skill, 'isInferred', False):
-                skills_by_category[category]["inferred"].append(skill)
-                inferred_count += 1
-            else:
-                skills_by_category[category]["explicit"].append(skill)
-                explicit_count += 1
+        # Grouping and tag building are cached on the skills' displayed fields
+        category_tags, explicit_count, inferred_count = group_skills(tuple(
+            (skill.name, skill.category, skill.isInferred, skill.inferredFrom)
+            for skill in skills
+        ))
         
         # Display summary metrics
         col1, col2, col3 = st.columns(3)
@@ -387,30 +622,10 @@ class ResumeParserUI:
         with col3:
             st.metric("🔵 Inferred", inferred_count)
         
-        # Render skills by category with color coding
-        for category, skill_groups in skills_by_category.items():
-            st.write(f"**{category}:**")
-            
-            # Create skill tags with color coding
-            skill_tags = []
-            
-            # Add explicit skills (green)
-            for skill in skill_groups["explicit"]:
-                skill_tags.append(f":green[{skill.name}]")
-            
-            # Add inferred skills (blue) with inference info
-            for skill in skill_groups["inferred"]:
-                inferred_from = getattr(skill, 'inferredFrom', None)
-                if inferred_from:
-                    skill_tags.append(f":blue[{skill.name}] *(inferred from: {inferred_from})*")
-                else:
-                    skill_tags.append(f":blue[{skill.name}] *(inferred)*")
-            
-            # Display skills in a flowing format
-            if skill_tags:
-                st.markdown(" • ".join(skill_tags))
-            
-            st.write("")  # Add spacing between categories
+        # Render skills by category with color coding, all categories in one block
+        st.markdown("\n\n".join(
+            f"**{category}:**\n\n{skill_tags}" for category, skill_tags in category_tags.items()
+        ))
         
         # Show detailed inference breakdown if there are inferred skills
         if inferred_count > 0:
@@ -418,8 +633,8 @@ class ResumeParserUI:
                 st.markdown("**GPT-4o Value-Add: Skills Inferred from Context**")
                 
                 for skill in skills:
-                    if getattr(skill, 'isInferred', False):
-                        inferred_from = getattr(skill, 'inferredFrom', 'context analysis')
+                    if skill.isInferred:
+                        inferred_from = skill.inferredFrom or 'context analysis'
                         col1, col2 = st.columns([1, 2])
                         with col1:
                             st.markdown(f":blue[**{skill.name}**]")
@@ -460,23 +675,16 @@ class ResumeParserUI:
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write(f"**Name:** {resume.contactInfo.fullName}")
+            contact_lines = [f"**Name:** {resume.contactInfo.fullName}"]
             if resume.contactInfo.email:
-                st.write(f"**Email:** {resume.contactInfo.email}")
+                contact_lines.append(f"**Email:** {resume.contactInfo.email}")
             if resume.contactInfo.phone:
-                st.write(f"**Phone:** {resume.contactInfo.phone}")
+                contact_lines.append(f"**Phone:** {resume.contactInfo.phone}")
+            st.markdown("\n\n".join(contact_lines))
         
         with col2:
-            if resume.contactInfo.location:
-                location_parts = []
-                if resume.contactInfo.location.city:
-                    location_parts.append(resume.contactInfo.location.city)
-                if resume.contactInfo.location.state:
-                    location_parts.append(resume.contactInfo.location.state)
-                if resume.contactInfo.location.country:
-                    location_parts.append(resume.contactInfo.location.country)
-                if location_parts:
-                    st.write(f"**Location:** {', '.join(location_parts)}")
+            if resume.contactInfo.location and resume.contactInfo.location.formatted:
+                st.write(f"**Location:** {resume.contactInfo.location.formatted}")
         
         # Summary
         if resume.summary:
@@ -493,32 +701,35 @@ class ResumeParserUI:
             st.subheader("💼 Work Experience")
             for exp in resume.workExperience:
                 with st.expander(f"{exp.jobTitle} at {exp.employer}"):
-                    st.write(f"**Duration:** {exp.startDate} to {exp.endDate}")
-                    if exp.location:
-                        location_parts = []
-                        if exp.location.city:
-                            location_parts.append(exp.location.city)
-                        if exp.location.state:
-                            location_parts.append(exp.location.state)
-                        if location_parts:
-                            st.write(f"**Location:** {', '.join(location_parts)}")
-                    st.write(f"**Description:** {exp.description}")
+                    exp_lines = [f"**Duration:** {exp.startDate} to {exp.endDate}"]
+                    if exp.location and exp.location.formatted:
+                        exp_lines.append(f"**Location:** {exp.location.formatted}")
+                    exp_lines.append(f"**Description:** {exp.description}")
+                    st.markdown("\n\n".join(exp_lines))
         
         # Education
         if resume.education:
             st.subheader("🎓 Education")
+            edu_lines = []
             for edu in resume.education:
-                st.write(f"**{edu.degreeName}** ({edu.degreeType}) - {edu.schoolName}")
+                edu_lines.append(f"**{edu.degreeName}** ({edu.degreeType}) - {edu.schoolName}")
                 if edu.graduationDate:
-                    st.write(f"Graduated: {edu.graduationDate}")
+                    edu_lines.append(f"Graduated: {edu.graduationDate}")
+            st.markdown("\n\n".join(edu_lines))
     
     def _render_json_output(self, resume: ResumeSchema) -> None:
         """Render JSON output view."""
         st.subheader("Raw JSON Output")
         
-        # Convert to dict and display
-        resume_dict = resume.dict()
-        json_str = json.dumps(resume_dict, indent=2, ensure_ascii=False)
+        # Serialize once per extracted resume, together with the download file
+        # name; every rerun (tab clicks, widget changes) would otherwise rebuild both
+        cached = st.session_state.get('resume_json')
+        if cached and cached[0] is resume:
+            _, json_str, file_name = cached
+        else:
+            json_str = dump_resume_json(resume.dict())
+            file_name = f"parsed_resume_{resume.contactInfo.fullName.replace(' ', '_')}.json"
+            st.session_state['resume_json'] = (resume, json_str, file_name)
         
         st.code(json_str, language="json")
         
@@ -526,7 +737,7 @@ class ResumeParserUI:
         st.download_button(
             label="📥 Download JSON",
             data=json_str,
-            file_name=f"parsed_resume_{resume.contactInfo.fullName.replace(' ', '_')}.json",
+            file_name=file_name,
             mime="application/json"
         )
     
@@ -537,14 +748,18 @@ class ResumeParserUI:
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write(f"**File Type:** {metadata.fileType}")
-            st.write(f"**File Extension:** {metadata.fileExtension}")
-            st.write(f"**Revision Date:** {metadata.revisionDate}")
+            st.markdown(
+                f"**File Type:** {metadata.fileType}\n\n"
+                f"**File Extension:** {metadata.fileExtension}\n\n"
+                f"**Revision Date:** {metadata.revisionDate}"
+            )
         
         with col2:
             if metadata.culture:
-                st.write(f"**Language:** {metadata.culture.language}")
-                st.write(f"**Country:** {metadata.culture.country}")
+                st.markdown(
+                    f"**Language:** {metadata.culture.language}\n\n"
+                    f"**Country:** {metadata.culture.country}"
+                )
         
         # Warnings
         if metadata.parserWarnings:
@@ -585,7 +800,9 @@ class ResumeParserUI:
                     if parsed_doc:
                         if st.button("🤖 Extract with GPT-4o", type="secondary"):
                             # Extract structured data using GPT-4o
-                            structured_data = self.extract_structured_data(parsed_doc)
+                            structured_data = self.extract_structured_data(
+                                parsed_doc, uploaded_file_data["sha256"]
+                            )
                             
                             if structured_data:
                                 # Store in session state for persistence
@@ -615,6 +832,7 @@ class ResumeParserUI:
 
 def main():
     """Main entry point for Streamlit app."""
+    start_model_warmup()
     app = ResumeParserUI()
     app.run()
 